@@ -0,0 +1,184 @@
+""" Benchmark suite for board evaluation and optimizer throughput.
+
+    python -m src.python.benchmark --output bench.json
+
+Every benchmark uses fixed seeds and reference boards, so results of two commits can be compared directly.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .board import Board
+from .cogs import Cog, EmptyCog, Player
+from .evaluator import ENGINES, EMPTY, encode_catalogue, evaluate_population
+from .genetic_algorithm import Idleon_Genetic_Algorithm
+from .special_cogs import Adjay, Collumm, Diggle, Downer, Leff, Omni, Rite, Rowow, Uppy
+
+BOARD_SIZES = ((8, 12), (16, 24), (32, 48))
+MASK_DENSITIES = {'sparse': 0.25, 'dense': 0.9}
+BOOSTED_TYPES = (Adjay, Diggle, Uppy, Downer, Leff, Rite, Rowow, Collumm, Omni)
+
+
+def reference_cogs(count: int, seed: int = 0, boosted_fraction: float = 0.15, height: int = 8, width: int = 12) -> List[Cog]:
+    """ Deterministic cog inventory with a mix of cogs, players and boosted cogs."""
+    rng = np.random.default_rng(seed)
+    cogs = []
+    for i in range(count):
+        build, flaggy, exp = rng.integers(1, 1000, 3).tolist()
+        roll = rng.random()
+        if roll < boosted_fraction:
+            cog_type = BOOSTED_TYPES[rng.integers(len(BOOSTED_TYPES))]
+            b_mult, f_mult, e_mult = rng.choice([1.25, 1.5, 2, 2.5], 3).tolist()
+            if cog_type is Rowow:
+                cogs.append(Rowow(build, flaggy, exp, b_mult, f_mult, e_mult, board_width=width))
+            elif cog_type is Collumm:
+                cogs.append(Collumm(build, flaggy, exp, b_mult, f_mult, e_mult, board_height=height))
+            else:
+                cogs.append(cog_type(build, flaggy, exp, b_mult, f_mult, e_mult))
+        elif roll < boosted_fraction + 0.1:
+            cogs.append(Player('player' + str(i), build, flaggy, exp))
+        else:
+            cogs.append(Cog(build, flaggy, exp))
+    return cogs
+
+
+def reference_board(height: int = 8, width: int = 12, density: float = 0.9, seed: int = 0) -> Tuple[Board, List[Cog]]:
+    """ Board with a fixed random mask and its unlocked cells filled from reference_cogs."""
+    rng = np.random.default_rng(seed)
+    board = Board(height, width)
+    board.unlock((rng.random((height, width)) < density).astype(int))
+    cells = np.flatnonzero(board.mask)
+    cogs = reference_cogs(len(cells), seed, height=height, width=width)
+    for cell, cog in zip(cells.tolist(), cogs):
+        board.place(cell % width, cell // width, cog)
+    return board, cogs
+
+
+def rate(func: Callable[[], Any], min_time: float = 0.5, repeats: int = 3) -> float:
+    """ Calls per second of func, best of repeats, each repeat lasting at least min_time."""
+    best = 0.0
+    for _ in range(repeats):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, calls / elapsed)
+    return best
+
+
+def bench_calculate_board(board: Board, min_time: float) -> Dict[str, float]:
+    """ Board.calculate_board evaluations per second for every engine."""
+    return {engine: rate(lambda: board.calculate_board(engine), min_time) for engine in ('object',) + tuple(ENGINES)}
+
+
+def bench_place_clear(board: Board, cogs: Sequence[Cog], min_time: float) -> Dict[str, float]:
+    """ Microseconds per Board.place of one cog and per Board.clear of a filled board."""
+    height, width = board.board.shape
+    cells = np.flatnonzero(board.mask).tolist()
+
+    def fill() -> None:
+        for cell, cog in zip(cells, cogs):
+            board.place(cell % width, cell // width, cog)
+
+    def fill_and_clear() -> None:
+        fill()
+        board.clear()
+        board.storage.clear()
+
+    def place_and_remove() -> None:
+        board.place(cells[0] % width, cells[0] // width, cogs[0])
+        board.place(cells[0] % width, cells[0] // width, EmptyCog())
+        board.storage.clear()
+
+    place_us = 1e6 / rate(place_and_remove, min_time) / 2
+    fill_clear_us = 1e6 / rate(fill_and_clear, min_time)
+    fill()
+    board.storage.clear()
+    return {'place_us': place_us, 'clear_us': max(fill_clear_us - place_us * len(cells), 0.0)}
+
+
+def bench_population(board: Board, cogs: Sequence[Cog], min_time: float, population_size: int = 1000,
+                     seed: int = 0) -> float:
+    """ Layouts per second scored by evaluate_population."""
+    rng = np.random.default_rng(seed)
+    cells = np.flatnonzero(board.mask)
+    layouts = np.full((population_size, board.mask.size), EMPTY, dtype=np.intp)
+    for layout in layouts:
+        layout[cells] = rng.permutation(len(cogs))[:len(cells)]
+    layouts = layouts.reshape((population_size,) + board.mask.shape)
+    catalogue = encode_catalogue(cogs)
+    return population_size * rate(lambda: evaluate_population(layouts, catalogue, board.mask), min_time)
+
+
+def bench_optimizer(board: Board, cogs: Sequence[Cog], generations: int = 20, population_size: int = 100,
+                    seed: int = 0) -> float:
+    """ End to end Idleon_Genetic_Algorithm generations per second."""
+    algorithm = Idleon_Genetic_Algorithm(board, cogs, population_size=population_size, generations=generations, seed=seed)
+    start = time.perf_counter()
+    algorithm.run()
+    return algorithm.generation / (time.perf_counter() - start)
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes: Sequence[Tuple[int, int]] = BOARD_SIZES, densities: Dict[str, float] = MASK_DENSITIES,
+                   min_time: float = 0.5, generations: int = 20, seed: int = 0) -> Dict[str, Any]:
+    results: Dict[str, Any] = {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'seed': seed,
+        'boards': [],
+    }
+    for height, width in sizes:
+        for name, density in densities.items():
+            board, cogs = reference_board(height, width, density, seed)
+            results['boards'].append({
+                'height': height,
+                'width': width,
+                'mask': name,
+                'unlocked': int(np.count_nonzero(board.mask)),
+                'calculate_board_per_s': bench_calculate_board(board, min_time),
+                **bench_place_clear(board, cogs, min_time),
+                'population_layouts_per_s': bench_population(board, cogs, min_time, seed=seed),
+                'optimizer_generations_per_s': bench_optimizer(board, cogs, generations, seed=seed),
+            })
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark board evaluation and optimizer throughput.')
+    parser.add_argument('--output', default='bench_output.json', help='JSON file to write results to')
+    parser.add_argument('--min-time', type=float, default=0.5, help='minimal duration of every timed repeat in seconds')
+    parser.add_argument('--generations', type=int, default=20, help='optimizer generations per board')
+    parser.add_argument('--sizes', default=','.join(str(h) + 'x' + str(w) for h, w in BOARD_SIZES),
+                        help='comma separated board sizes as HEIGHTxWIDTH')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    sizes = [tuple(int(n) for n in size.split('x')) for size in args.sizes.split(',')]
+    results = run_benchmarks(sizes, min_time=args.min_time, generations=args.generations, seed=args.seed)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    for board in results['boards']:
+        print(str(board['height']) + 'x' + str(board['width']) + ' ' + board['mask'] + ': ' +
+              ', '.join(engine + '=' + str(round(value)) + '/s' for engine, value in board['calculate_board_per_s'].items()) +
+              ', population=' + str(round(board['population_layouts_per_s'])) + '/s' +
+              ', generations=' + str(round(board['optimizer_generations_per_s'], 1)) + '/s')
+
+
+if __name__ == '__main__':
+    main()
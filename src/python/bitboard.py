@@ -0,0 +1,177 @@
+""" Bitboard evaluation engine.
+
+Every (H, W) boolean plane (unlocked cells, cells holding boosted cogs of one footprint) is stored as H rows of
+ceil(W / 64) uint64 words, column x being bit x % 64 of word x // 64, so every board size works with the same
+shift and AND code. The mask and, for every boost footprint, the cells each offset boosts and the word gathers
+shifting a plane by each offset are built once per mask (MaskBitboards, kept by the Board). An evaluation only
+packs positions of boosted cogs, shifts them and ANDs them with the footprints.
+"""
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from .cogs import EmptyCog
+from .special_cogs import BoostedCog
+
+WORD = 64
+
+
+def pack(cells: np.ndarray) -> np.ndarray:
+    """ (..., H, words) row words of (..., H, W) boolean planes."""
+    cells = np.asarray(cells, dtype=bool)
+    words = -(-cells.shape[-1] // WORD)
+    packed = np.packbits(cells, axis=-1, bitorder='little')
+    data = np.zeros(cells.shape[:-1] + (words * 8,), dtype=np.uint8)
+    data[..., :packed.shape[-1]] = packed
+    return data.view('<u8').astype(np.uint64)
+
+
+def unpack(rows: np.ndarray, width: int) -> np.ndarray:
+    """ (..., H, W) boolean planes of row words."""
+    data = np.ascontiguousarray(rows, dtype='<u8').view(np.uint8)
+    return np.unpackbits(data, axis=-1, count=width, bitorder='little').astype(bool)
+
+
+class Shifts(NamedTuple):
+    """ Word gathers and bit shifts moving a plane by every (dx, dy) offset.
+
+        A shifted plane is (planes[high] << bits) | ((planes[low] >> carry) & keep), where planes are flat
+        (H * words) planes each followed by one zero word, which every gather from outside a plane points to.
+    """
+    dx: np.ndarray
+    dy: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    bits: np.ndarray
+    carry: np.ndarray
+    keep: np.ndarray
+
+    @classmethod
+    def build(cls, height: int, words: int, dx: np.ndarray, dy: np.ndarray) -> 'Shifts':
+        """ Shifts of the first of flat planes, see _flat and moved."""
+        dx, dy = np.asarray(dx, dtype=np.intp).reshape(-1), np.asarray(dy, dtype=np.intp).reshape(-1)
+        word, bits = np.divmod(dx, WORD)
+        source_y = np.arange(height)[None, :, None] - dy[:, None, None]
+        source_w = np.arange(words)[None, None, :] - word[:, None, None]
+
+        def gather(source_w: np.ndarray) -> np.ndarray:
+            valid = (source_y >= 0) & (source_y < height) & (source_w >= 0) & (source_w < words)
+            return np.where(valid, source_y * words + source_w, height * words).reshape(len(dx), height * words)
+
+        bits = bits.astype(np.uint64)[:, None]
+        keep = np.where(bits > 0, ~np.uint64(0), np.uint64(0))
+        return cls(dx, dy, gather(source_w), gather(source_w - 1), bits, (np.uint64(WORD) - bits) % np.uint64(WORD), keep)
+
+    def apply(self, planes: np.ndarray) -> np.ndarray:
+        """ (offsets, H * words) shifted planes of flat planes, see _flat."""
+        planes = planes.ravel()
+        return (planes[self.high] << self.bits) | ((planes[self.low] >> self.carry) & self.keep)
+
+    def moved(self, plane: np.ndarray) -> 'Shifts':
+        """ The same shifts of other planes, plane being the plane index of every offset."""
+        start = plane.reshape(-1, 1) * (self.high.shape[1] + 1)
+        return self._replace(high=self.high + start, low=self.low + start)
+
+
+def _flat(rows: np.ndarray) -> np.ndarray:
+    """ (n, H * words + 1) flat planes followed by a zero word of (H, words) or (n, H, words) planes, see Shifts."""
+    size = rows.shape[-2] * rows.shape[-1]
+    flat = np.zeros((rows.size // max(size, 1), size + 1), dtype=np.uint64)
+    flat[:, :-1] = rows.reshape(-1, size)
+    return flat
+
+
+def shift(rows: np.ndarray, dx, dy) -> np.ndarray:
+    """ Planes moved by dx columns and dy rows, bits moved past the last column may stay set above width.
+
+        rows has shape (H, words) or (n, H, words), dx and dy are scalars or arrays of shape (n,).
+    """
+    height, words = rows.shape[-2:]
+    scalar = np.ndim(dx) == 0 and np.ndim(dy) == 0 and rows.ndim == 2
+    dx, dy = np.broadcast_arrays(np.atleast_1d(dx), np.atleast_1d(dy))
+    shifts = Shifts.build(height, words, dx, dy)
+    if rows.ndim == 3:
+        shifts = shifts.moved(np.arange(len(dx)))
+    moved = shifts.apply(_flat(rows)).reshape(-1, height, words)
+    return moved[0] if scalar else moved
+
+
+class Footprint(NamedTuple):
+    """ Shifts of the offsets of one footprint boosting at least one cell of a mask and the (offsets, H * words)
+        unlocked cells they boost from unlocked cells.
+    """
+    shifts: Shifts
+    reach: np.ndarray
+
+
+class MaskBitboards:
+    """ Bitboards of one mask: unlocked cells and the footprints of boost patterns.
+
+        Footprints are built on first use (Board.unlock builds those of every boosted cog class) and kept
+        until the mask is replaced, together with their concatenations for the footprint sets evaluated.
+    """
+    def __init__(self, mask: np.ndarray) -> None:
+        self.mask = np.asarray(mask).astype(bool)
+        self.height, self.width = self.mask.shape
+        self.words = -(-self.width // WORD)
+        self.unlocked = pack(self.mask)
+        self.cells = self.mask.ravel()
+        self._footprints: Dict[Tuple[Tuple[int, int], ...], Footprint] = {}
+        self._combined: Dict[Tuple[Tuple[Tuple[int, int], ...], ...], Footprint] = {}
+
+    def footprint(self, key: Tuple[Tuple[int, int], ...]) -> Footprint:
+        """ Footprint of relative (dx, dy) offsets key, see BoostedCog.offsets_key."""
+        if key not in self._footprints:
+            offsets = np.array(key, dtype=np.intp).reshape(-1, 2)
+            shifts = Shifts.build(self.height, self.words, offsets[:, 0], offsets[:, 1])
+            unlocked = _flat(self.unlocked)
+            reach = shifts.apply(unlocked) & unlocked[:, :-1]
+            boosts = reach.any(axis=1)
+            self._footprints[key] = Footprint(Shifts(*(field[boosts] for field in shifts)), reach[boosts])
+        return self._footprints[key]
+
+    def combined(self, keys: Tuple[Tuple[Tuple[int, int], ...], ...]) -> Footprint:
+        """ Footprints of keys concatenated, shifting plane i of flat planes (see _flat) by offsets of keys[i]."""
+        if keys not in self._combined:
+            footprints = [self.footprint(key) for key in keys]
+            shifts = Shifts(*(np.concatenate(fields) for fields in zip(*(f.shifts for f in footprints))))
+            plane = np.repeat(np.arange(len(keys)), [len(f.reach) for f in footprints])
+            self._combined[keys] = Footprint(shifts.moved(plane), np.concatenate([f.reach for f in footprints]))
+        return self._combined[keys]
+
+
+def evaluate_board_bitboard(board) -> Tuple[float, float, float]:
+    """ Board totals with boost targets found by shifting source planes and masking them with cached footprints.
+
+        Only occupied unlocked cells are read. Boosted cogs of the same footprint share one source plane, all
+        (footprint, offset) shifts are done at once and only words holding a boosted cell are unpacked into
+        target cells, whose source is the target cell minus the offset.
+    """
+    bitboards = board.bitboards
+    height, width, words = bitboards.height, bitboards.width, bitboards.words
+    cells = board.board.ravel()
+    occupied = np.flatnonzero((cells != EmptyCog()) & bitboards.cells)
+    cogs = cells[occupied].tolist()
+    base = np.array([cog.get_base_values() for cog in cogs], dtype=float).reshape(-1, 3)
+    boosted = [(cell, cog) for cell, cog in zip(occupied.tolist(), cogs) if isinstance(cog, BoostedCog)]
+    if boosted:
+        footprints: Dict[Tuple[Tuple[int, int], ...], List[int]] = {}
+        for cell, cog in boosted:
+            footprints.setdefault(cog.offsets_key(), []).append(cell)
+        footprint = bitboards.combined(tuple(footprints))
+        sources = np.zeros((len(footprints), height * width), dtype=bool)
+        for p, plane in enumerate(footprints.values()):
+            sources[p, plane] = True
+        mult = np.ones((2, height * width))
+        mult[:, [cell for cell, _ in boosted]] = np.array([(cog.b_mult, cog.f_mult) for _, cog in boosted], dtype=float).T
+        hits = footprint.shifts.apply(_flat(pack(sources.reshape(-1, height, width)))) & footprint.reach
+        hit_words = np.flatnonzero(hits)
+        word, bit = np.nonzero(np.unpackbits(hits.ravel()[hit_words, None].astype('<u8').view(np.uint8), axis=1, bitorder='little'))
+        pair, cell_word = np.divmod(hit_words[word], height * words)
+        target = (cell_word // words) * width + (cell_word % words) * WORD + bit
+        source = target - footprint.shifts.dy[pair] * width - footprint.shifts.dx[pair]
+        field = np.ones((2, height * width))
+        np.multiply.at(field, (slice(None), target), mult[:, source])
+        base[:, :2] *= field[:, occupied].T
+    totals = base.sum(axis=0)
+    return float(totals[0]), float(totals[1]), float(totals[2])
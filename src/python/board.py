@@ -1,11 +1,19 @@
-from typing import Tuple
+from typing import List, Tuple
 from .cogs import Cog, EmptyCog, Player
 from .special_cogs import BoostedCog
+from .bitboard import MaskBitboards
+from .evaluator import ENGINES, board_fields, boost_target_table
+from .inventory import COG_TYPES
+from .profiling import PROFILER
+from .sparse import SparseBoard
 import numpy as np
 
 class Board:
     def __init__(self, height: int = 8, width: int = 12, locked: bool = True) -> None:
         self._visualization_board = ''
+        self._delta_state = None
+        self._pending_move = None
+        self.transposition_table = None
         self.board = np.array([[EmptyCog() for w in range(width)] for h in range(height)])
         if locked:
             self.mask = np.zeros_like(self.board)
@@ -16,10 +24,73 @@ class Board:
         self.total_flaggy = 0
         self.total_exp = 0
 
+    @property
+    def mask(self) -> np.array:
+        return self._mask
+
+    @mask.setter
+    def mask(self, mask: np.array) -> None:
+        """ Store a read-only copy, so cached boost target tables and bitboards can't go stale by in-place edits."""
+        self._drop_delta_state()
+        mask = np.array(mask)
+        mask.flags.writeable = False
+        self._mask = mask
+        self._boost_targets = {}
+        self._bitboards = MaskBitboards(mask)
+        self._sparse = None
+
+    @property
+    def bitboards(self) -> MaskBitboards:
+        """ Packed mask and boost footprints used by the 'bitboard' engine, see bitboard.MaskBitboards."""
+        return self._bitboards
+
+    @property
+    def sparse(self) -> SparseBoard:
+        """ Cogs in unlocked cells by coordinates, used by the 'sparse' engine, see sparse.SparseBoard.
+
+            Built from the board on first use, then kept up to date by every change of the board
+            until the mask is replaced.
+        """
+        if self._sparse is None:
+            self._sparse = SparseBoard.from_board(self)
+        return self._sparse
+
+    def _sparse_place(self, cell: int, cog: Cog) -> None:
+        if self._sparse is not None:
+            y, x = divmod(cell, self.board.shape[1])
+            self._sparse.place(x, y, cog)
+
     def unlock(self, mask: np.array):
+        """ Set unlocked cells and build boost target tables and footprint bitboards of every boosted cog
+            class footprint at the board size (BoostedCog.footprint) and of boosted cogs already on the board.
+
+            Tables are cached per boost pattern until the mask is replaced. The stored mask is a read-only
+            copy, so it is changed through unlock (or by assigning a new mask), never edited in place.
+        """
         assert mask.shape == self.board.shape, "Mask shape is different than board shape!"
         self.mask = mask
-        
+        height, width = self.board.shape
+        for cog_type in COG_TYPES:
+            if issubclass(cog_type, BoostedCog):
+                key = cog_type.footprint_key(height, width)
+                self._boost_targets[key] = boost_target_table(cog_type.footprint(height, width), self.mask)
+                self._bitboards.footprint(key)
+        for cog in self.board.flatten():
+            if isinstance(cog, BoostedCog):
+                self._boost_target_table(cog)
+                self._bitboards.footprint(cog.offsets_key())
+
+    def _boost_target_table(self, cog: BoostedCog) -> Tuple[np.ndarray, np.ndarray]:
+        key = cog.offsets_key()
+        if key not in self._boost_targets:
+            self._boost_targets[key] = boost_target_table(cog.offsets(), self.mask)
+        return self._boost_targets[key]
+
+    def boost_targets(self, cog: BoostedCog, cell: int) -> np.ndarray:
+        """ Flat indices of unlocked cells boosted by the cog placed in given flat cell."""
+        indptr, indices = self._boost_target_table(cog)
+        return indices[indptr[cell]:indptr[cell + 1]]
+
     def empty(self) -> bool:
         for cog in self.board.flatten():
             if not isinstance(cog, EmptyCog):
@@ -29,10 +100,28 @@ class Board:
     def place(self, x:int, y:int, cog: Cog = EmptyCog()) -> None:
         if self.validate(x, y):
             assert isinstance(cog, Cog), "You can't place non-cogs on board!"
+            if PROFILER.enabled:
+                PROFILER.count('place')
+            self._drop_delta_state()
             if not isinstance(self.board[y, x], EmptyCog):
                 self.storage.append(self.board[y, x])
             self.board[y,x] = cog
+            self._sparse_place(y * self.board.shape[1] + x, cog)
         
+    def snapshot(self) -> Tuple[np.ndarray, List[Cog]]:
+        """ Copy of cogs on the board and in storage, see restore."""
+        return self.board.copy(), list(self.storage)
+
+    def restore(self, snapshot: Tuple[np.ndarray, List[Cog]]) -> None:
+        """ Put back cogs saved by snapshot."""
+        self._drop_delta_state()
+        cells, storage = snapshot
+        if self._sparse is not None:
+            for cell in np.flatnonzero(self.board.ravel() != cells.ravel()).tolist():
+                self._sparse_place(cell, cells.flat[cell])
+        self.board[...] = cells
+        self.storage = list(storage)
+
     def clear(self):
         self.reset_board_values()
         for x in range(self.board.shape[1]):
@@ -45,15 +134,189 @@ class Board:
         self.total_exp = 0
 
     def validate(self, x, y) -> bool:
+        if PROFILER.enabled:
+            PROFILER.count('validate')
         return (x >= 0 and y >= 0 and x < self.board.shape[1] and y < self.board.shape[0]) and (self.mask[y, x])
 
     def get_totals(self) -> Tuple[int, int, int]:
         return self.total_build, self.total_flaggy, self.total_exp
 
-    def calculate_board(self):
-        self.reset_loop()
-        self.multiply_loop()
-        self.sum_loop()
+    def calculate_board(self, engine: str = 'object'):
+        """ Calculate board totals.
+
+            The default 'object' engine also updates current values of every cog on the board,
+            other engines (see evaluator.ENGINES) only set the totals. When transposition_table is set
+            (see transposition.TranspositionTable), other engines reuse totals of equivalent layouts.
+            With profiling.PROFILER enabled every phase is timed.
+        """
+        if self._pending_move is None:
+            self._delta_state = None
+        if PROFILER.enabled:
+            self._profiled_calculate_board(engine)
+        elif engine == 'object':
+            self.reset_loop()
+            self.multiply_loop()
+            self.sum_loop()
+        else:
+            self._engine_calculate_board(engine)
+
+    def _profiled_calculate_board(self, engine: str) -> None:
+        PROFILER.count('evaluations')
+        if engine == 'object':
+            for phase in (self.reset_loop, self.multiply_loop, self.sum_loop):
+                with PROFILER.timed('calculate_board.' + phase.__name__):
+                    phase()
+        else:
+            with PROFILER.timed('calculate_board.' + engine):
+                self._engine_calculate_board(engine)
+
+    def _engine_calculate_board(self, engine: str) -> None:
+        assert engine in ENGINES, "Unknown evaluation engine: " + str(engine) + "!"
+        if self.transposition_table is None:
+            self.total_build, self.total_flaggy, self.total_exp = ENGINES[engine](self)
+            return
+        key = self.transposition_table.board_key(self)
+        totals = self.transposition_table.get(key)
+        if totals is None:
+            totals = tuple(ENGINES[engine](self))
+            self.transposition_table.put(key, totals)
+        self.total_build, self.total_flaggy, self.total_exp = totals
+
+    def _drop_delta_state(self) -> None:
+        assert self._pending_move is None, "Commit or roll back the pending move first!"
+        self._delta_state = None
+
+    def _sync_delta_state(self) -> None:
+        """ Per-cell base values, multiplier field and contribution used by delta moves."""
+        if self._delta_state is None:
+            base, field = board_fields(self)
+            contribution = base.copy()
+            contribution[:2] *= field
+            self._delta_state = (base, field, contribution)
+            self.total_build, self.total_flaggy, self.total_exp = contribution.sum(axis=1).tolist()
+
+    def delta_place(self, x: int, y: int, cog: Cog = EmptyCog()) -> Tuple[float, float, float]:
+        """ Tentatively place cog and return the change of totals.
+
+            Only cells inside boost footprints of the replaced and the placed cog are updated.
+            The move has to be finished with commit (replaced cog goes to storage) or rollback.
+        """
+        if not self.validate(x, y):
+            return self._delta_apply([])
+        assert isinstance(cog, Cog), "You can't place non-cogs on board!"
+        return self._delta_apply([(y * self.board.shape[1] + x, cog)], displaced=True)
+
+    def delta_swap(self, a: Tuple[int, int], b: Tuple[int, int]) -> Tuple[float, float, float]:
+        """ Tentatively swap cogs in cells a=(x, y) and b=(x, y) and return the change of totals."""
+        if not (self.validate(*a) and self.validate(*b)):
+            return self._delta_apply([])
+        width = self.board.shape[1]
+        cell_a, cell_b = a[1] * width + a[0], b[1] * width + b[0]
+        cells = self.board.ravel()
+        return self._delta_apply([(cell_a, cells[cell_b]), (cell_b, cells[cell_a])])
+
+    def _delta_apply(self, changes: List[Tuple[int, Cog]], displaced: bool = False) -> Tuple[float, float, float]:
+        assert self._pending_move is None, "Commit or roll back the pending move first!"
+        if PROFILER.enabled:
+            PROFILER.count('delta_moves')
+        self._sync_delta_state()
+        base, field, contribution = self._delta_state
+        cells = self.board.ravel()
+        old_cogs = [cells[cell] for cell, _ in changes]
+        boosts = []
+        for (cell, new_cog), old_cog in zip(changes, old_cogs):
+            if isinstance(old_cog, BoostedCog):
+                boosts.append((self.boost_targets(old_cog, cell), old_cog, False))
+            if isinstance(new_cog, BoostedCog):
+                boosts.append((self.boost_targets(new_cog, cell), new_cog, True))
+        affected = np.unique(np.concatenate([[cell for cell, _ in changes]] + [t for t, _, _ in boosts]).astype(np.intp))
+        old_totals = self.get_totals()
+        self._pending_move = (changes, old_cogs, displaced, affected, base[:, affected], field[:, affected], contribution[:, affected], old_totals)
+        for targets, cog, add in boosts:
+            if add:
+                field[0, targets] *= cog.b_mult
+                field[1, targets] *= cog.f_mult
+            else:
+                field[0, targets] /= cog.b_mult
+                field[1, targets] /= cog.f_mult
+        for cell, new_cog in changes:
+            cells[cell] = new_cog
+            self._sparse_place(cell, new_cog)
+            base[:, cell] = new_cog.get_base_values()
+        old_contribution = contribution[:, affected].sum(axis=1)
+        contribution[:, affected] = base[:, affected]
+        contribution[:2, affected] *= field[:, affected]
+        delta = contribution[:, affected].sum(axis=1) - old_contribution
+        self.total_build, self.total_flaggy, self.total_exp = (np.array(old_totals, dtype=float) + delta).tolist()
+        return float(delta[0]), float(delta[1]), float(delta[2])
+
+    def commit(self) -> None:
+        """ Keep the pending delta move."""
+        assert self._pending_move is not None, "There is no pending move!"
+        _, old_cogs, displaced, *_ = self._pending_move
+        if displaced:
+            self.storage.extend(cog for cog in old_cogs if not isinstance(cog, EmptyCog))
+        self._pending_move = None
+
+    def rollback(self) -> None:
+        """ Undo the pending delta move."""
+        assert self._pending_move is not None, "There is no pending move!"
+        changes, old_cogs, _, affected, old_base, old_field, old_contribution, old_totals = self._pending_move
+        base, field, contribution = self._delta_state
+        cells = self.board.ravel()
+        for (cell, _), old_cog in zip(changes, old_cogs):
+            cells[cell] = old_cog
+            self._sparse_place(cell, old_cog)
+        base[:, affected] = old_base
+        field[:, affected] = old_field
+        contribution[:, affected] = old_contribution
+        self.total_build, self.total_flaggy, self.total_exp = old_totals
+        self._pending_move = None
+
+    def marginal_gains(self, weights: Tuple[float, float, float] = (1, 1, 1)) -> np.ndarray:
+        """ Weighted change of totals from placing every stored cog in every cell, shape (len(storage), H, W).
+
+            Entry [s, y, x] equals the weighted delta_place(x, y, storage[s]) (the replaced cog goes to
+            storage), but all of them come from the delta state multiplier field and the boost target tables
+            at once: values of the stored cog in the cell, minus the contribution of the replaced cog and of
+            its boosts, plus the boost the stored cog adds to its targets. Locked cells are -inf.
+        """
+        assert self._pending_move is None, "Commit or roll back the pending move first!"
+        self._sync_delta_state()
+        base, field, contribution = self._delta_state
+        height, width = self.board.shape
+        size = height * width
+        weights = np.asarray(weights, dtype=float)
+        unlocked = np.asarray(self.mask).astype(bool).ravel()
+        cells = self.board.ravel()
+        # loss of emptying every cell and contribution of its occupant's targets without that occupant's boost
+        loss = weights @ contribution
+        stripped = {}
+        for cell in np.flatnonzero(unlocked).tolist():
+            cog = cells[cell]
+            if isinstance(cog, BoostedCog):
+                targets = self.boost_targets(cog, cell)
+                kept = contribution[:2, targets] / np.array([[cog.b_mult], [cog.f_mult]])
+                loss[cell] += weights[:2] @ (contribution[:2, targets] - kept).sum(axis=1)
+                stripped[cell] = (targets, kept)
+        stored = np.array([cog.get_base_values() for cog in self.storage], dtype=float).reshape(-1, 3)
+        gains = (stored[:, :2] * weights[:2]) @ field + stored[:, 2:] * weights[2] - loss
+        # boost added by stored cogs, once per footprint
+        footprints = {}
+        for s, cog in enumerate(self.storage):
+            if isinstance(cog, BoostedCog):
+                footprints.setdefault(cog.offsets_key(), []).append(s)
+        for stored_cogs in footprints.values():
+            indptr, indices = self._boost_target_table(self.storage[stored_cogs[0]])
+            sources = np.repeat(np.arange(size), np.diff(indptr))
+            boosted = np.stack([np.bincount(sources, contribution[m, indices], size) for m in range(2)])
+            for cell, (targets, kept) in stripped.items():
+                common, _, j = np.intersect1d(indices[indptr[cell]:indptr[cell + 1]], targets, return_indices=True)
+                boosted[:, cell] += (kept[:, j] - contribution[:2, common]).sum(axis=1)
+            mults = np.array([(self.storage[s].b_mult, self.storage[s].f_mult) for s in stored_cogs], dtype=float)
+            gains[stored_cogs] += ((mults - 1) * weights[:2]) @ boosted
+        gains[:, ~unlocked] = -np.inf
+        return gains.reshape(len(self.storage), height, width)
 
     def reset_loop(self):
         self.reset_board_values()
@@ -61,20 +324,21 @@ class Board:
             c.reset()
 
     def multiply_loop(self):
+        cells = self.board.ravel()
+        width = self.board.shape[1]
+        boosts = 0
         for x in range(self.board.shape[1]):
             for y in range(self.board.shape[0]):
-                if self.validate(x, y):
-                    c = self.board[y, x]
-                    if isinstance(c, BoostedCog):
-                        boosted_coordinates, boosted_values = c.boosted()
-                        for bc in boosted_coordinates:
-                            dx, dy = bc[0], bc[1]
-                            
-                            if self.validate(x+dx, y+dy):
-                                boosted_cog = self.board[y+dy, x+dx]
-                                boosted_cog.apply_boost(*boosted_values)
-                                self.board[y+dy, x+dx] = boosted_cog
-                                
+                c = cells[y * width + x]
+                if isinstance(c, BoostedCog):
+                    boosted_values = c.boosted()[1]
+                    targets = self.boost_targets(c, y * width + x).tolist()
+                    for target in targets:
+                        cells[target].apply_boost(*boosted_values)
+                    boosts += len(targets)
+        if PROFILER.enabled:
+            PROFILER.count('boosts', boosts)
+
     def sum_loop(self):
         for x in range(self.board.shape[1]):
             for y in range(self.board.shape[0]):
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .board import Board
+from .cogs import Cog, EmptyCog, Player
+from .genetic_algorithm import Idleon_Genetic_Algorithm
+from .local_search import LocalSearch
+from .profiling import PROFILER
+from .special_cogs import BoostedCog
+
+Signature = Tuple
+
+
+def cog_signature(cog: Cog) -> Signature:
+    """ Hashable description of a cog, equal for cogs that behave the same on the board."""
+    build, flaggy, exp = (float(v) for v in (cog._base_build, cog._base_flaggy, cog._base_exp))
+    mults = (float(cog.b_mult), float(cog.f_mult), float(cog.e_mult)) if isinstance(cog, BoostedCog) else (1.0, 1.0, 1.0)
+    span = getattr(cog, 'board_width', getattr(cog, 'board_height', 0))
+    name = cog.name if isinstance(cog, Player) else None
+    return (type(cog).__name__, build, flaggy, exp) + mults + (span, name)
+
+
+def _digest(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """ On-disk cache of optimized layouts with LRU eviction.
+
+        Entries are JSON files named <mask and weights hash>-<query hash>.json, where the query hash also
+        covers the sorted cog signatures, so the key doesn't depend on inventory order. Reading an entry
+        refreshes its modification time and the least recently used entries are removed above max_entries.
+    """
+    def __init__(self, directory: str, max_entries: int = 256) -> None:
+        assert max_entries >= 1, "Cache should hold at least one entry!"
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _mask_key(mask: np.ndarray, weights: Sequence[float]) -> str:
+        mask = np.asarray(mask).astype(bool)
+        return _digest([list(mask.shape), mask.ravel().astype(int).tolist(), [float(w) for w in weights]])[:16]
+
+    def key(self, mask: np.ndarray, cogs: Sequence[Cog], weights: Sequence[float]) -> str:
+        signatures = sorted(cog_signature(cog) for cog in cogs)
+        return self._mask_key(mask, weights) + '-' + _digest([self._mask_key(mask, weights), signatures])[:32]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    def _read(self, key: str, touch: bool = True) -> Optional[Dict[str, Any]]:
+        """ Entry stored under key, touch marks it as recently used."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if touch:
+            self._touch(key)
+        return entry
+
+    def _touch(self, key: str) -> None:
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, mask: np.ndarray, cogs: Sequence[Cog], weights: Sequence[float]) -> Optional[Dict[str, Any]]:
+        """ Cached entry of exactly this query."""
+        entry = self._read(self.key(mask, cogs, weights))
+        if PROFILER.enabled:
+            PROFILER.count('result_cache.hits' if entry is not None else 'result_cache.misses')
+        return entry
+
+    def nearest(self, mask: np.ndarray, cogs: Sequence[Cog], weights: Sequence[float]) -> Optional[Dict[str, Any]]:
+        """ Cached entry with the same mask and weights sharing most cogs with given inventory.
+
+            Only the returned entry counts as used, the scanned ones keep their place in the LRU order.
+        """
+        prefix = self._mask_key(mask, weights) + '-'
+        wanted = Counter(cog_signature(cog) for cog in cogs)
+        best, best_key, best_overlap = None, None, 0
+        for name in os.listdir(self.directory):
+            if not (name.startswith(prefix) and name.endswith('.json')):
+                continue
+            key = name[:-len('.json')]
+            entry = self._read(key, touch=False)
+            if entry is None:
+                continue
+            cached = Counter(tuple(signature) for signature in entry['layout'] if signature is not None)
+            overlap = sum((cached & wanted).values())
+            if overlap > best_overlap:
+                best, best_key, best_overlap = entry, key, overlap
+        if best_key is not None:
+            self._touch(best_key)
+        return best
+
+    def put(self, board: Board, cogs: Sequence[Cog], weights: Sequence[float], value: float) -> str:
+        """ Store layout currently on the board as the result for given inventory."""
+        key = self.key(board.mask, cogs, weights)
+        entry = {
+            'value': value,
+            'totals': [float(total) for total in board.get_totals()],
+            'layout': [None if isinstance(cog, EmptyCog) else list(cog_signature(cog)) for cog in board.board.ravel()],
+        }
+        path = self._path(key)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(entry, f)
+        os.replace(path + '.tmp', path)
+        self._evict()
+        return key
+
+    def _evict(self) -> None:
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.json')]
+        if len(paths) > self.max_entries:
+            paths.sort(key=os.path.getmtime)
+            for path in paths[:len(paths) - self.max_entries]:
+                os.remove(path)
+
+
+def apply_cached_layout(board: Board, cogs: Sequence[Cog], entry: Dict[str, Any]) -> Board:
+    """ Place cogs matching cached layout signatures, the other cogs go to storage."""
+    available: Dict[Signature, List[Cog]] = defaultdict(list)
+    for cog in cogs:
+        available[cog_signature(cog)].append(cog)
+    board.clear()
+    board.storage = []
+    width = board.board.shape[1]
+    for cell, signature in enumerate(entry['layout']):
+        if signature is not None and available[tuple(signature)]:
+            board.place(cell % width, cell // width, available[tuple(signature)].pop())
+    board.storage = [cog for same in available.values() for cog in same]
+    return board
+
+
+def optimize_with_cache(board: Board, cogs: Sequence[Cog], cache: ResultCache,
+                        weights: Tuple[float, float, float] = (1, 1, 1), time_budget: float = 1.0,
+                        seed: Optional[int] = None) -> Tuple[Board, float, str]:
+    """ Optimize cog placement reusing cached results.
+
+        Returns the board with the best layout, its weighted value and how it was obtained: 'hit' for an
+        identical cached query, 'warm' for local search started from the closest cached layout with new cogs
+        in storage and 'cold' for a genetic algorithm run followed by local search.
+    """
+    entry = cache.get(board.mask, cogs, weights)
+    if entry is not None:
+        apply_cached_layout(board, cogs, entry)
+        board.calculate_board()
+        return board, entry['value'], 'hit'
+    entry = cache.nearest(board.mask, cogs, weights)
+    if entry is not None:
+        apply_cached_layout(board, cogs, entry)
+        source = 'warm'
+        search_budget = time_budget
+    else:
+        algorithm = Idleon_Genetic_Algorithm(board, cogs, weights=weights, generations=10 ** 9,
+                                             time_budget=time_budget / 2, seed=seed)
+        algorithm.run()
+        algorithm.apply_best()
+        source = 'cold'
+        search_budget = time_budget / 2
+    value = LocalSearch(board, weights=weights, time_budget=search_budget, seed=seed).run()
+    cache.put(board, cogs, weights, value)
+    return board, value, source
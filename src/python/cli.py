@@ -0,0 +1,153 @@
+""" Batch optimization of many accounts.
+
+    python -m src.python.cli saves/ --output results.jsonl --workers 8 --time-budget 5
+
+Accounts are read lazily from save files (see savefile) and optimized in a pool of worker processes.
+Every finished account is appended to the output as one JSON line as soon as it is done, so an interrupted
+batch resumes by running the same command again: accounts already in the output are skipped. An account
+that can't be decoded or optimized is written as {"account": ..., "error": ...} and the batch goes on,
+failed accounts are tried again by the next run.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+
+from .board import Board
+from .cogs import Player
+from .evaluator import EMPTY, board_layout
+from .genetic_algorithm import Idleon_Genetic_Algorithm
+from .local_search import LocalSearch
+from .savefile import AccountRecord, decode_account, iter_accounts
+
+
+def optimize_account(record: AccountRecord, time_budget: float = 1.0, weights: Tuple[float, float, float] = (1, 1, 1),
+                     population_size: int = 100, seed: Optional[int] = None) -> Dict[str, Any]:
+    """ Optimize one account within time budget, half spent by the genetic algorithm and half by local search."""
+    start = time.perf_counter()
+    cogs = record.inventory.to_cogs()
+    board = Board(*record.mask.shape)
+    board.unlock(record.mask.astype(int))
+    algorithm = Idleon_Genetic_Algorithm(board, cogs, weights=weights, population_size=population_size,
+                                         generations=10 ** 9, time_budget=time_budget / 2, seed=seed)
+    algorithm.run()
+    algorithm.apply_best()
+    value = LocalSearch(board, weights=weights, time_budget=time_budget / 2, seed=seed).run()
+    layout = board_layout(board, cogs)
+    ids = record.inventory.ids
+    storage = {id(cog) for cog in board.storage}
+    return {
+        'account': record.account,
+        'value': value,
+        'totals': [float(total) for total in board.get_totals()],
+        'layout': [[None if i == EMPTY else int(ids[i]) for i in row] for row in layout.tolist()],
+        'storage': [int(cog_id) for cog_id, cog in zip(ids.tolist(), cogs) if id(cog) in storage],
+        'players': [cog.info() for cog in board.board.flatten() if isinstance(cog, Player)],
+        'generations': algorithm.generation,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def _optimize_value(value: Dict[str, Any], time_budget: float, weights: Tuple[float, float, float],
+                    population_size: int, seed: Optional[int]) -> Dict[str, Any]:
+    """ Decode and optimize one account object, run in worker processes."""
+    return optimize_account(decode_account(value), time_budget, weights, population_size, seed)
+
+
+def _account_name(value: Any) -> str:
+    return str(value.get('account', '')) if isinstance(value, dict) else ''
+
+
+def finished_accounts(output: str) -> Set[str]:
+    """ Accounts already optimized in the output, failed accounts and an unfinished last line are ignored."""
+    done = set()
+    if os.path.exists(output):
+        with open(output) as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                    if 'error' not in result:
+                        done.add(result['account'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+    return done
+
+
+def _ends_with_newline(output: str) -> bool:
+    """ Whether results can be appended to the output right away (it is empty or its last line is complete)."""
+    if not os.path.exists(output) or os.path.getsize(output) == 0:
+        return True
+    with open(output, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def run_batch(inputs: Sequence[str], output: str, workers: int = 1, time_budget: float = 1.0,
+              weights: Tuple[float, float, float] = (1, 1, 1), population_size: int = 100, seed: Optional[int] = None,
+              progress: bool = True) -> int:
+    """ Optimize every account not yet in output, return the number of accounts optimized by this call.
+
+        At most 2 * workers accounts are read ahead and decoded by the workers, results are written by the
+        main process in the order they finish. Failed accounts are written as errors and not counted.
+    """
+    done = finished_accounts(output)
+    accounts = (value for value in iter_accounts(inputs) if _account_name(value) not in done)
+    start = time.perf_counter()
+    written = failed = 0
+    pending: Dict[Future, str] = {}
+    separator = '' if _ends_with_newline(output) else '\n'
+    with ProcessPoolExecutor(workers) as executor, open(output, 'a') as f:
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < 2 * workers:
+                value = next(accounts, None)
+                if value is None:
+                    exhausted = True
+                else:
+                    future = executor.submit(_optimize_value, value, time_budget, weights, population_size, seed)
+                    pending[future] = _account_name(value)
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                account = pending.pop(future)
+                try:
+                    result = future.result()
+                    written += 1
+                except Exception as error:
+                    result = {'account': account, 'error': type(error).__name__ + ': ' + str(error)}
+                    failed += 1
+                f.write(separator + json.dumps(result) + '\n')
+                f.flush()
+                separator = ''
+            if progress:
+                elapsed = time.perf_counter() - start
+                print('\r' + str(written) + ' accounts optimized, ' + str(failed) + ' failed, ' + str(len(pending)) +
+                      ' running, ' + str(round(written / elapsed, 2)) + ' accounts/s', end='', file=sys.stderr, flush=True)
+    if progress:
+        print(file=sys.stderr)
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Optimize cog placement of many accounts in parallel.')
+    parser.add_argument('inputs', nargs='+', help='save files (JSON, JSON lines) or directories of them')
+    parser.add_argument('--output', default='results.jsonl', help='JSON lines file results are appended to')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--time-budget', type=float, default=1.0, help='optimization time per account in seconds')
+    parser.add_argument('--weights', default='1,1,1', help='comma separated build, flaggy and exp weights')
+    parser.add_argument('--population-size', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--quiet', action='store_true', help='do not report progress')
+    args = parser.parse_args(argv)
+    weights = tuple(float(w) for w in args.weights.split(','))
+    assert len(weights) == 3, "Weights should be build, flaggy and exp!"
+    run_batch(args.inputs, args.output, args.workers, args.time_budget, weights, args.population_size, args.seed,
+              not args.quiet)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,8 @@ import numpy as np
 
 
 class Cog:
+    __slots__ = ('x', 'y', '_base_build', '_base_flaggy', '_base_exp', 'build', 'flaggy', 'exp')
+
     def __init__(self, build:int = 0, flaggy:int = 0, exp:int = 0) -> None:
         self.x = None
         self.y = None
@@ -27,6 +29,10 @@ class Cog:
 
     def get_values(self) -> Tuple[int, int, int]:
         return self.build, self.flaggy, self.exp
+
+    def get_base_values(self) -> Tuple[int, int, int]:
+        """ Values counted into board totals before any boost is applied."""
+        return self._base_build, self._base_flaggy, self._base_exp
     
     def __str__(self) -> str:
         return 'c'
@@ -41,8 +47,29 @@ class Cog:
             ', e=', str(self.exp), ')'])
 
 class EmptyCog(Cog):
+    """ Immutable placeholder of an empty cell, EmptyCog() always returns the same shared instance."""
+    __slots__ = ()
+    _instance = None
+
+    def __new__(cls) -> 'EmptyCog':
+        if cls._instance is None:
+            instance = super().__new__(cls)
+            for name in Cog.__slots__:
+                object.__setattr__(instance, name, None if name in ('x', 'y') else 0)
+            cls._instance = instance
+        return cls._instance
+
     def __init__(self) -> None:
-        super().__init__(0, 0, 0)
+        pass
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("EmptyCog is immutable!")
+
+    def __reduce__(self):
+        return EmptyCog, ()
+
+    def reset(self) -> None:
+        return None
 
     def apply_boost(self, b_mult: float = 1, f_mult: float = 1, e_mult: float = 1) -> None:
         return None
@@ -51,6 +78,8 @@ class EmptyCog(Cog):
         return '.'
 
 class Player(Cog):
+    __slots__ = ('name',)
+
     def __init__(self, name:str ,build: int = 0, flaggy: int = 0, exp: int = 0) -> None:
         super().__init__(build, flaggy, exp)
         self.name = name
@@ -64,6 +93,9 @@ class Player(Cog):
     def get_values(self) -> Tuple[int, int, int]:
         return self.build, self.flaggy, 0
 
+    def get_base_values(self) -> Tuple[int, int, int]:
+        return self._base_build, self._base_flaggy, 0
+
     def __str__(self) -> str:
         return 'p'
 
@@ -0,0 +1,126 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .cogs import Cog
+from .evaluator import EMPTY, evaluate_population
+
+
+def place_layout(board, layout: np.ndarray, cogs: Sequence[Cog], storage: Optional[Sequence[int]] = None):
+    """ Place an (H, W) layout of indices into cogs (EMPTY for empty cells) on the board and calculate it.
+
+        storage lists the indices of cogs left in storage, by default every cog not in the layout.
+    """
+    layout = np.asarray(layout)
+    board.clear()
+    board.storage = []
+    for (y, x), i in np.ndenumerate(layout):
+        if i != EMPTY:
+            board.place(x, y, cogs[i])
+    if storage is None:
+        placed = set(layout[layout != EMPTY].tolist())
+        storage = [i for i in range(len(cogs)) if i not in placed]
+    board.storage = [cogs[i] for i in storage]
+    board.calculate_board()
+    return board
+
+
+class LayoutSolution:
+    """ Results of a solver keeping its best layout of cogs on board in best_layout.
+
+        Subclasses set board, cogs, catalogue (evaluator.encode_catalogue of cogs) and mask.
+    """
+    def totals(self) -> np.ndarray:
+        """ Build, flaggy and exp of the best layout."""
+        return evaluate_population(self.best_layout[None], self.catalogue, self.mask)[0]
+
+    def apply_best(self):
+        """ Place the best layout on the board, cogs that didn't fit go to storage."""
+        return place_layout(self.board, self.best_layout, self.cogs)
+
+
+class LayoutDecoder:
+    """ Maps orderings of an inventory onto the unlocked cells of a mask, so every layout is feasible.
+
+        An individual is a permutation of genes 0..L-1, where L = max(unlocked cells, cogs). Gene at
+        position k goes to k-th unlocked cell (row by row), genes < number of cogs are cogs and the others
+        are empty slots. Genes past the number of unlocked cells are cogs left in storage.
+        With more cogs than cells the overflow ends up in storage, with more cells than cogs the
+        remaining cells stay empty. Random keys (any L real numbers) decode through their stable argsort.
+
+        empty_slots overrides the number of empty slot genes (L - cogs). By default there are just enough
+        to fill the cells cogs can't, so no individual leaves a cog in storage next to an empty cell. With
+        one empty slot per unlocked cell every layout has an individual, see encode.
+    """
+    def __init__(self, mask: np.ndarray, cog_count: int, empty_slots: Optional[int] = None) -> None:
+        self.mask = np.asarray(mask).astype(bool)
+        self.cells = np.flatnonzero(self.mask)
+        self.cog_count = cog_count
+        self.empty_slots = max(len(self.cells) - cog_count, 0) if empty_slots is None else empty_slots
+        assert self.empty_slots >= len(self.cells) - cog_count, "Not enough empty slots to fill the cells!"
+        self.genome_length = cog_count + self.empty_slots
+
+    def random_population(self, count: int, rng: np.random.Generator) -> np.ndarray:
+        """ (count, L) random permutations."""
+        return rng.permuted(np.tile(np.arange(self.genome_length), (count, 1)), axis=1)
+
+    @staticmethod
+    def keys_to_permutations(keys: np.ndarray) -> np.ndarray:
+        """ Permutations ordering genes by their random keys."""
+        return np.argsort(keys, axis=-1, kind='stable')
+
+    def decode(self, population: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """ Layouts of cog indices, shape (N, H, W), for permutations of shape (N, L).
+
+            Layouts are written into out when given, a contiguous (N, H, W) array of any signed integer dtype.
+        """
+        shape = (population.shape[0],) + self.mask.shape
+        if out is None:
+            out = np.empty(shape, dtype=np.intp)
+        assert out.shape == shape and out.flags.c_contiguous, "Output should be a contiguous (N, H, W) array!"
+        genes = population[:, :len(self.cells)]
+        layouts = out.reshape(population.shape[0], self.mask.size)
+        layouts.fill(EMPTY)
+        layouts[:, self.cells] = np.where(genes < self.cog_count, genes, EMPTY)
+        return out
+
+    def decode_keys(self, keys: np.ndarray) -> np.ndarray:
+        """ Layouts of cog indices, shape (N, H, W), for random keys of shape (N, L)."""
+        return self.decode(self.keys_to_permutations(keys))
+
+    def storage(self, individual: np.ndarray) -> np.ndarray:
+        """ Indices of cogs an individual leaves in storage."""
+        rest = individual[len(self.cells):]
+        return rest[rest < self.cog_count]
+
+    def encode(self, layout: np.ndarray) -> np.ndarray:
+        """ Permutation decoding to given layout of cog indices, cogs not in the layout go to storage.
+
+            Cogs in locked cells are not part of the layout and go to storage as well. Every empty cell
+            takes an empty slot, so the layout can't leave more cells empty than there are empty slots.
+        """
+        placed = np.asarray(layout).ravel()[self.cells]
+        assert len(set(placed[placed != EMPTY].tolist())) == np.count_nonzero(placed != EMPTY), "Layout places a cog twice!"
+        assert ((placed >= EMPTY) & (placed < self.cog_count)).all(), "Layout refers to unknown cogs!"
+        empty_cells = np.count_nonzero(placed == EMPTY)
+        assert empty_cells <= self.empty_slots, "Layout leaves more cells empty than there are empty slots!"
+        stored = np.setdiff1d(np.arange(self.cog_count), placed[placed != EMPTY])
+        empty = np.arange(self.cog_count, self.genome_length)
+        individual = np.empty(self.genome_length, dtype=np.intp)
+        individual[:len(self.cells)] = placed
+        individual[:len(self.cells)][placed == EMPTY] = empty[:empty_cells]
+        individual[len(self.cells):] = np.concatenate((empty[empty_cells:], stored))
+        return individual
+
+    def to_board(self, individual: np.ndarray, board, cogs: Sequence[Cog]):
+        """ Place the individual on the board, cogs that didn't fit go to storage."""
+        return place_layout(board, self.decode(individual[None])[0], cogs, self.storage(individual).tolist())
+
+    def from_board(self, board, cogs: Sequence[Cog]) -> np.ndarray:
+        """ Permutation of the layout currently on the board, cogs not in cogs are ignored.
+
+            Cogs of cogs that are not on the board go to storage, see encode.
+        """
+        index = {id(cog): i for i, cog in enumerate(cogs)}
+        layout = np.array([index.get(id(cog), EMPTY) for cog in board.board.ravel()], dtype=np.intp)
+        return self.encode(layout.reshape(board.board.shape))
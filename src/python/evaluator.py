@@ -0,0 +1,271 @@
+from itertools import chain
+from typing import Dict, List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from .bitboard import evaluate_board_bitboard
+from .cogs import Cog, EmptyCog, Player
+from .inventory import COG_TYPES, CogInventory
+from .sparse import evaluate_board_sparse, line_reach
+from .special_cogs import BoostedCog
+
+NO_PATTERN = -1
+EMPTY = -1
+
+_SHIFT_GATHERS: Dict[Tuple[Tuple[Tuple[Tuple[int, int], ...], ...], int, int], Tuple[np.ndarray, int, int]] = {}
+
+
+class CatalogueArrays(NamedTuple):
+    """ Array form of a cog catalogue used by the batched evaluator.
+
+        Rows are indexed by cog index in the catalogue, the extra last row describes an empty cell,
+        so layouts can use EMPTY (-1) directly as an index.
+
+        base:       (K + 1, 3) build, flaggy and exp counted into totals before boosts
+        mult:       (K + 1, 2) build and flaggy multipliers of boosted cogs, 1 elsewhere
+        pattern:    (K + 1,) index into patterns of boosted cogs, NO_PATTERN otherwise
+        patterns:   relative (dx, dy) offsets of every boost pattern in the catalogue
+
+    """
+    base: np.ndarray
+    mult: np.ndarray
+    pattern: np.ndarray
+    patterns: List[np.ndarray]
+
+
+def footprint_key(cog: BoostedCog) -> Tuple[Tuple[int, int], ...]:
+    """ Hashable relative (dx, dy) offsets boosted by the cog."""
+    return cog.offsets_key()
+
+
+def boost_target_table(offsets: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ Flat indices of unlocked cells boosted from every unlocked cell by a boost pattern.
+
+        Returned in compressed sparse row form (indptr, indices): targets of flat cell i are
+        indices[indptr[i]:indptr[i + 1]], in the order of offsets. Locked cells boost nothing.
+    """
+    mask = np.asarray(mask).astype(bool)
+    height, width = mask.shape
+    offsets = np.asarray(offsets, dtype=np.intp).reshape(-1, 2)
+    y, x = np.divmod(np.arange(height * width), width)
+    target_y = y[:, None] + offsets[None, :, 1]
+    target_x = x[:, None] + offsets[None, :, 0]
+    valid = (target_y >= 0) & (target_y < height) & (target_x >= 0) & (target_x < width)
+    valid &= mask.ravel()[:, None]
+    valid[valid] = mask[target_y[valid], target_x[valid]]
+    indptr = np.concatenate(([0], np.cumsum(valid.sum(axis=1))))
+    return indptr, (target_y * width + target_x)[valid]
+
+
+def _pattern_id(cog: BoostedCog, patterns: List[np.ndarray], pattern_index: Dict[Tuple[Tuple[int, int], ...], int]) -> int:
+    key = footprint_key(cog)
+    if key not in pattern_index:
+        pattern_index[key] = len(patterns)
+        patterns.append(cog.offsets())
+    return pattern_index[key]
+
+
+def encode_catalogue(cogs: Sequence[Cog]) -> CatalogueArrays:
+    """ Convert cog catalogue into arrays consumed by evaluate_population."""
+    base = np.zeros((len(cogs) + 1, 3))
+    mult = np.ones((len(cogs) + 1, 2))
+    pattern = np.full(len(cogs) + 1, NO_PATTERN, dtype=np.intp)
+    patterns: List[np.ndarray] = []
+    pattern_index: Dict[Tuple[Tuple[int, int], ...], int] = {}
+    for i, cog in enumerate(cogs):
+        assert isinstance(cog, Cog), "Catalogue can contain only cogs!"
+        base[i] = cog.get_base_values()
+        if isinstance(cog, BoostedCog):
+            pattern[i] = _pattern_id(cog, patterns, pattern_index)
+            mult[i] = cog.b_mult, cog.f_mult
+    return CatalogueArrays(base, mult, pattern, patterns)
+
+
+def encode_inventory(inventory: CogInventory) -> CatalogueArrays:
+    """ Convert struct-of-arrays inventory into arrays consumed by evaluate_population.
+
+        Only one prototype cog per distinct boost pattern is created to look up its offsets.
+    """
+    boosted = np.array([issubclass(cog_type, BoostedCog) for cog_type in COG_TYPES])[inventory.kind]
+    base = np.zeros((len(inventory) + 1, 3))
+    base[:-1] = inventory.base
+    base[:-1][inventory.kind == COG_TYPES.index(Player), 2] = 0
+    mult = np.ones((len(inventory) + 1, 2))
+    mult[:-1][boosted] = inventory.mult[boosted, :2]
+    pattern = np.full(len(inventory) + 1, NO_PATTERN, dtype=np.intp)
+    patterns: List[np.ndarray] = []
+    pattern_index: Dict[Tuple[Tuple[int, int], ...], int] = {}
+    kinds, inverse = np.unique(np.stack((inventory.kind[boosted], inventory.span[boosted]), axis=1), axis=0, return_inverse=True)
+    kind_patterns = [_pattern_id(inventory.prototype(kind, span), patterns, pattern_index) for kind, span in kinds.tolist()]
+    pattern[:-1][boosted] = np.asarray(kind_patterns, dtype=np.intp)[inverse.reshape(-1)]
+    return CatalogueArrays(base, mult, pattern, patterns)
+
+
+def board_layout(board, cogs: Sequence[Cog]) -> np.ndarray:
+    """ Layout of catalogue indices for cogs currently on the board, EMPTY for cells without catalogue cog."""
+    index = {id(cog): i for i, cog in enumerate(cogs)}
+    layout = np.full(board.board.shape, EMPTY, dtype=np.intp)
+    for (y, x), cog in np.ndenumerate(board.board):
+        layout[y, x] = index.get(id(cog), EMPTY)
+    return layout
+
+
+def _shift(offset: int, size: int) -> Tuple[slice, slice]:
+    """ Source and target slices along one axis for given relative offset."""
+    if offset >= 0:
+        return slice(0, max(size - offset, 0)), slice(offset, size)
+    return slice(-offset, size), slice(0, max(size + offset, 0))
+
+
+def _others_product(values: np.ndarray, axis: int) -> np.ndarray:
+    """ Product of values at all other positions along axis, from prefix and suffix products."""
+    def part(positions: slice) -> Tuple[slice, ...]:
+        index = [slice(None)] * values.ndim
+        index[axis] = positions
+        return tuple(index)
+
+    product = np.ones_like(values)
+    product[part(slice(1, None))] = np.cumprod(values[part(slice(None, -1))], axis=axis)
+    product[part(slice(None, -1))] *= np.cumprod(values[part(slice(None, 0, -1))], axis=axis)[part(slice(None, None, -1))]
+    return product
+
+
+def _shift_gather(keys: Tuple[Tuple[Tuple[int, int], ...], ...], height: int, width: int) -> Tuple[np.ndarray, int, int]:
+    """ Flat indices (offsets, H, W) gathering (P, H, W) fields, padded by (pad_y, pad_x) ones on every side,
+        moved by every offset of pattern keys[p] from field p. Cached per keys and board size.
+    """
+    cache_key = (keys, height, width)
+    if cache_key not in _SHIFT_GATHERS:
+        plane = np.repeat(np.arange(len(keys)), [len(key) for key in keys])
+        dx, dy = np.array([offset for key in keys for offset in key], dtype=np.intp).reshape(-1, 2).T
+        inside = (np.abs(dx) < width) & (np.abs(dy) < height)
+        plane, dx, dy = plane[inside], dx[inside], dy[inside]
+        pad_y, pad_x = int(np.abs(dy).max(initial=0)), int(np.abs(dx).max(initial=0))
+        padded_height, padded_width = height + 2 * pad_y, width + 2 * pad_x
+        rows = np.arange(height)[None, :, None] - dy[:, None, None] + pad_y + plane[:, None, None] * padded_height
+        cells = rows * padded_width + np.arange(width)[None, None, :] - dx[:, None, None] + pad_x
+        _SHIFT_GATHERS[cache_key] = (cells, pad_y, pad_x)
+    return _SHIFT_GATHERS[cache_key]
+
+
+def _shifted_product(boosts: np.ndarray, keys: Tuple[Tuple[Tuple[int, int], ...], ...], height: int, width: int) -> np.ndarray:
+    """ Product of (2, P, H, W) boost fields moved by every offset of their pattern keys, gathered at once."""
+    cells, pad_y, pad_x = _shift_gather(keys, height, width)
+    padded = np.ones((2, len(keys), height + 2 * pad_y, width + 2 * pad_x))
+    padded[:, :, pad_y:pad_y + height, pad_x:pad_x + width] = boosts
+    return np.take(padded.reshape(2, -1), cells, axis=1).prod(axis=1)
+
+
+def multiplier_field(pattern: np.ndarray, mult: np.ndarray, mask: np.ndarray, patterns: List[np.ndarray]) -> np.ndarray:
+    """ Build and flaggy multiplier of every cell.
+
+        Works on a single board (pattern of shape (H, W), mult of shape (2, H, W)) as well as
+        on stacked boards with any leading dimensions (pattern (..., H, W), mult (..., 2, H, W)).
+        Each boost pattern is applied as a masked source field multiplied into shifted target slices,
+        the shifts of a single board all at once (_shifted_product). Patterns boosting their whole row
+        or column (sparse.line_reach) share one source field per axis, applied as products along lines.
+    """
+    height, width = pattern.shape[-2:]
+    field = np.ones(mult.shape)
+    lines: Tuple[List[int], List[int]] = ([], [])
+    shifted, keys = [], []
+    for p, offsets in enumerate(patterns):
+        key = tuple(map(tuple, offsets.tolist()))
+        line = line_reach(key)
+        if line is not None and line[1] >= (width, height)[line[0]] - 1:
+            lines[line[0]].append(p)
+        else:
+            shifted.append(p)
+            keys.append(key)
+    for axis, line_patterns in enumerate(lines):
+        if not line_patterns:
+            continue
+        sources = (pattern[..., None] == np.array(line_patterns, dtype=np.intp)).any(axis=-1) & mask
+        if sources.any():
+            field *= _others_product(np.where(sources[..., None, :, :], mult, 1.0), -1 - axis)
+    if pattern.ndim == 2 and shifted:
+        sources = (pattern == np.array(shifted, dtype=np.intp)[:, None, None]) & mask
+        present = sources.any(axis=(1, 2))
+        if present.any():
+            boosts = np.where(sources[present], mult[:, None], 1.0)
+            field *= _shifted_product(boosts, tuple(key for key, kept in zip(keys, present.tolist()) if kept), height, width)
+        return field
+    for p in shifted:
+        sources = (pattern == p) & mask
+        if not sources.any():
+            continue
+        boost = np.where(sources[..., None, :, :], mult, 1.0)
+        for dx, dy in patterns[p].tolist():
+            source_y, target_y = _shift(dy, height)
+            source_x, target_x = _shift(dx, width)
+            field[..., target_y, target_x] *= boost[..., source_y, source_x]
+    return field
+
+
+def evaluate_population(layouts: np.ndarray, catalogue: Union[CatalogueArrays, CogInventory, Sequence[Cog]], mask: np.ndarray,
+                        chunk_size: int = 4096) -> np.ndarray:
+    """ Total build, flaggy and exp of every layout, shape (N, 3).
+
+        layouts:    (N, H, W) catalogue indices of cogs in each cell, EMPTY for empty cells
+        catalogue:  cogs indexed by layouts, as a sequence of cogs, a CogInventory or encoded by encode_catalogue
+        mask:       (H, W) unlocked cells, shared by all layouts
+
+        Boost semantics follow Board.multiply_loop: boosts are applied only from unlocked cells
+        to unlocked cells and exp is never multiplied in totals.
+    """
+    if isinstance(catalogue, CogInventory):
+        catalogue = encode_inventory(catalogue)
+    elif not isinstance(catalogue, CatalogueArrays):
+        catalogue = encode_catalogue(catalogue)
+    layouts = np.asarray(layouts)
+    mask = np.asarray(mask).astype(bool)
+    assert layouts.ndim == 3 and layouts.shape[1:] == mask.shape, "Layouts should have shape (N, H, W) matching the mask!"
+    totals = np.empty((layouts.shape[0], 3))
+    for start in range(0, layouts.shape[0], chunk_size):
+        chunk = layouts[start:start + chunk_size]
+        field = multiplier_field(catalogue.pattern[chunk], np.moveaxis(catalogue.mult[chunk], -1, 1), mask, catalogue.patterns)
+        contribution = np.moveaxis(catalogue.base[chunk], -1, 1) * mask
+        contribution[:, :2] *= field
+        totals[start:start + chunk_size] = contribution.sum(axis=(2, 3))
+    return totals
+
+
+def board_fields(board) -> Tuple[np.ndarray, np.ndarray]:
+    """ Masked base values (3, H * W) and build/flaggy multiplier field (2, H * W) of a board.
+
+        Only occupied unlocked cells are read into base value, multiplier and boost pattern grids, whose
+        multiplier field comes from the shifted masked products of multiplier_field, as in evaluate_population.
+    """
+    height, width = board.board.shape
+    mask = np.asarray(board.mask).astype(bool)
+    cells = board.board.ravel()
+    occupied = np.flatnonzero((cells != EmptyCog()) & mask.ravel())
+    cogs = cells[occupied].tolist()
+    base = np.zeros((3, height * width))
+    values = chain.from_iterable([cog.get_base_values() for cog in cogs])
+    base[:, occupied] = np.fromiter(values, dtype=float, count=3 * len(cogs)).reshape(-1, 3).T
+    boosted = [(cell, cog) for cell, cog in zip(occupied.tolist(), cogs) if isinstance(cog, BoostedCog)]
+    mult = np.ones((2, height * width))
+    pattern = np.full(height * width, NO_PATTERN, dtype=np.intp)
+    patterns: List[np.ndarray] = []
+    pattern_index: Dict[Tuple[Tuple[int, int], ...], int] = {}
+    if boosted:
+        sources = [cell for cell, _ in boosted]
+        mult[:, sources] = np.array([(cog.b_mult, cog.f_mult) for _, cog in boosted], dtype=float).T
+        pattern[sources] = [_pattern_id(cog, patterns, pattern_index) for _, cog in boosted]
+    field = multiplier_field(pattern.reshape(height, width), mult.reshape(2, height, width), mask, patterns)
+    return base, field.reshape(2, height * width)
+
+
+def evaluate_board_vectorized(board) -> Tuple[float, float, float]:
+    base, field = board_fields(board)
+    base[:2] *= field
+    totals = base.sum(axis=1)
+    return float(totals[0]), float(totals[1]), float(totals[2])
+
+
+ENGINES = {
+    'vectorized': evaluate_board_vectorized,
+    'bitboard': evaluate_board_bitboard,
+    'sparse': evaluate_board_sparse,
+}
@@ -5,6 +5,7 @@ import random
 import timeit
 
 from src.python.board import Board
+from src.python.genetic_algorithm import Idleon_Genetic_Algorithm
 
 # Number of individuals in each generation
 POPULATION_SIZE = 100
@@ -83,15 +84,32 @@ class Individual(object):
 
 class GA_Optimizer:
 
-	def __init__(self, population_size = 100) -> None:
-		self.board = Board(locked=False)
+	def __init__(self, board = None, cogs = (), population_size = 100, **kwargs) -> None:
+		'''
+		Driver of Idleon_Genetic_Algorithm, kwargs are passed to the algorithm
+		'''
+		self.board = board if board is not None else Board(locked=False)
+		self.cogs = list(cogs)
 		self.population_size = population_size
+		self.kwargs = kwargs
+		self.algorithm = None
 		self.population = []
 
 	def init_population(self):
-		population = []
-		for _ in range(self.population_size):
-			individual = Individual.create_gnome
+		self.algorithm = Idleon_Genetic_Algorithm(self.board, self.cogs,
+			population_size=self.population_size, **self.kwargs)
+		self.algorithm.initialize()
+		self.population = self.algorithm.population
+
+	def run(self):
+		'''
+		Evolve cog placements and put the best one on the board
+		'''
+		if self.algorithm is None:
+			self.init_population()
+		self.algorithm.run()
+		self.population = self.algorithm.population
+		return self.algorithm.apply_best()
 
 # Driver code
 def main():
@@ -1,3 +1,18 @@
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .board import Board
+from .cogs import Cog
+from .encoding import LayoutDecoder
+from .evaluator import encode_catalogue, evaluate_population
+from .operators import CROSSOVERS, MUTATIONS, tournament_select
+from .parallel import ParallelScorer
+from .profiling import PROFILER
+from .shared_population import SharedMemoryScorer
+from .transposition import MemoizedScorer, TranspositionTable
+
 
 class Idleon_Genetic_Algorithm:
     """Genetic Algorithm for cogs placement in game Legends of Idleon.
@@ -8,7 +23,177 @@ class Idleon_Genetic_Algorithm:
         2. You provide it with the unlocked places on board.
         3. You run it
         4. It initializes population of N Individuals. Each of them has their own cogs placement
+        5. Every generation the best individuals are kept (elitism), the rest is replaced by children
+           of tournament selected parents (order or PMX crossover, swap or insert mutation, done for
+           the whole population at once by operators)
+        6. It stops after given number of generations or when the time budget runs out
 
+    Individuals are permutations of genes 0..L-1, where L = max(unlocked cells, cogs). Gene at position k
+    goes to k-th unlocked cell (row by row), genes < number of cogs are cogs, the others are empty slots.
+    Genes past the number of unlocked cells are cogs left in storage, so every individual is a valid layout
+    (encoding.LayoutDecoder).
+
+    Whole populations are scored at once by scorer, a callable taking (N, H, W) layouts of cog indices
+    and returning (N, 3) totals, by default evaluator.evaluate_population. With workers > 1 scoring is
+    spread over a process pool (parallel.ParallelScorer), which gives the same scores as the serial path.
+    With shared_memory the pool scores layouts in shared memory blocks instead of pickled copies
+    (shared_population.SharedMemoryScorer).
+    In deterministic mode the time budget is ignored, so the result depends only on seed and generations.
+    With a transposition_table, layouts equivalent to already scored ones are not scored again
+    (transposition.MemoizedScorer), its hit_rate tells how many evaluations were saved.
     """
-    def __init__(self) -> None:
-        self.__possible_cogs
\ No newline at end of file
+    def __init__(self, board: Board, cogs: Sequence[Cog], weights: Tuple[float, float, float] = (1, 1, 1),
+                 objective: Optional[Callable[[np.ndarray], np.ndarray]] = None, population_size: int = 100,
+                 generations: int = 100, time_budget: Optional[float] = None, elite_fraction: float = 0.1,
+                 tournament_size: int = 3, crossover_rate: float = 0.9, mutation_rate: float = 0.3,
+                 seed: Optional[int] = None, scorer: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                 workers: int = 1, deterministic: bool = False,
+                 transposition_table: Optional[TranspositionTable] = None, shared_memory: bool = False,
+                 crossover_operator: str = 'order', mutation_operator: str = 'swap') -> None:
+        assert crossover_operator in CROSSOVERS, "Unknown crossover: " + str(crossover_operator) + "!"
+        assert mutation_operator in MUTATIONS, "Unknown mutation: " + str(mutation_operator) + "!"
+        assert population_size >= 2, "Population should have at least two individuals!"
+        self.board = board
+        self.cogs = list(cogs)
+        self.mask = np.asarray(board.mask).astype(bool)
+        self.decoder = LayoutDecoder(self.mask, len(self.cogs))
+        self.cells = self.decoder.cells
+        self.genome_length = self.decoder.genome_length
+        self.weights = np.asarray(weights, dtype=float)
+        self.objective = objective if objective is not None else self.weighted_objective
+        self.population_size = population_size
+        self.generations = generations
+        self.time_budget = None if deterministic else time_budget
+        self.elite_size = max(1, int(elite_fraction * population_size))
+        self.tournament_size = tournament_size
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.crossover_operator = crossover_operator
+        self.mutation_operator = mutation_operator
+        self.rng = np.random.default_rng(seed)
+        self.catalogue = encode_catalogue(self.cogs)
+        self._pool_scorer = None
+        if scorer is None and workers > 1:
+            if shared_memory:
+                self._pool_scorer = SharedMemoryScorer(self.catalogue, self.mask, workers, capacity=population_size)
+            else:
+                self._pool_scorer = ParallelScorer(self.catalogue, self.mask, workers)
+        self.scorer = scorer or self._pool_scorer or self.default_scorer
+        self.transposition_table = transposition_table
+        if transposition_table is not None:
+            self.scorer = MemoizedScorer(self.catalogue, self.mask, transposition_table, self.scorer)
+        self.population = None
+        self.totals = None
+        self.fitness = None
+        self.generation = 0
+        self.history: List[float] = []
+
+    def weighted_objective(self, totals: np.ndarray) -> np.ndarray:
+        return totals @ self.weights
+
+    def default_scorer(self, layouts: np.ndarray) -> np.ndarray:
+        return evaluate_population(layouts, self.catalogue, self.mask)
+
+    def decode(self, population: np.ndarray) -> np.ndarray:
+        """ Layouts of cog indices, shape (N, H, W), for population of shape (N, L)."""
+        return self.decoder.decode(population)
+
+    def evaluate(self, population: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if PROFILER.enabled:
+            PROFILER.count('ga.evaluations', len(population))
+        if isinstance(self.scorer, SharedMemoryScorer):
+            # decode straight into the shared block, the pool then scores it without a copy
+            totals = self.scorer(self.decoder.decode(population, self.scorer.buffer(len(population))))
+        else:
+            totals = self.scorer(self.decode(population))
+        return totals, self.objective(totals)
+
+    def initialize(self) -> None:
+        self.population = self.decoder.random_population(self.population_size, self.rng)
+        self.totals, self.fitness = self.evaluate(self.population)
+        self.generation = 0
+        self.history = [float(self.fitness.max())]
+
+    def select(self, count: int) -> np.ndarray:
+        """ Indices of tournament winners."""
+        return tournament_select(self.fitness, count, self.tournament_size, self.rng)
+
+    def crossover(self, parents_a: np.ndarray, parents_b: np.ndarray) -> np.ndarray:
+        """ Children of (N, L) parent pairs, see operators.CROSSOVERS."""
+        return CROSSOVERS[self.crossover_operator](parents_a, parents_b, self.rng)
+
+    def mutate(self, population: np.ndarray) -> None:
+        """ Mutate (N, L) individuals in place with probability mutation_rate, see operators.MUTATIONS."""
+        if self.genome_length > 1:
+            MUTATIONS[self.mutation_operator](population, self.mutation_rate, self.rng)
+
+    def breed(self, count: int) -> np.ndarray:
+        """ Children of tournament selected parents after crossover and mutation."""
+        parents = self.select(2 * count).reshape(count, 2)
+        children = self.population[parents[:, 0]]
+        crossed = self.rng.random(count) < self.crossover_rate
+        children[crossed] = self.crossover(self.population[parents[crossed, 0]], self.population[parents[crossed, 1]])
+        self.mutate(children)
+        return children
+
+    def step(self) -> None:
+        """ Evolve population by one generation."""
+        if PROFILER.enabled:
+            with PROFILER.timed('ga.generation'):
+                self._step()
+            PROFILER.count('ga.generations')
+        else:
+            self._step()
+
+    def _step(self) -> None:
+        order = np.argsort(-self.fitness)
+        elite = order[:self.elite_size]
+        children = self.breed(self.population_size - self.elite_size)
+        children_totals, children_fitness = self.evaluate(children)
+        self.population = np.concatenate((self.population[elite], children))
+        self.totals = np.concatenate((self.totals[elite], children_totals))
+        self.fitness = np.concatenate((self.fitness[elite], children_fitness))
+        self.generation += 1
+        self.history.append(float(self.fitness.max()))
+
+    def run(self) -> Tuple[np.ndarray, float]:
+        """ Run until number of generations or time budget is reached, return best individual and its fitness."""
+        start = time.perf_counter()
+        try:
+            if self.population is None:
+                self.initialize()
+            while self.generation < self.generations:
+                if self.time_budget is not None and time.perf_counter() - start >= self.time_budget:
+                    break
+                self.step()
+        finally:
+            self.close()
+        return self.best()
+
+    def close(self) -> None:
+        """ Shut down worker processes, they are started again when needed."""
+        if self._pool_scorer is not None:
+            self._pool_scorer.close()
+
+    def best(self) -> Tuple[np.ndarray, float]:
+        i = int(np.argmax(self.fitness))
+        return self.population[i], float(self.fitness[i])
+
+    def top(self, count: int) -> np.ndarray:
+        """ Copy of the count fittest individuals."""
+        return self.population[np.argsort(-self.fitness)[:count]].copy()
+
+    def immigrate(self, individuals: np.ndarray) -> None:
+        """ Replace the weakest individuals with given ones."""
+        individuals = individuals[:self.population_size]
+        if len(individuals) == 0:
+            return
+        worst = np.argsort(self.fitness)[:len(individuals)]
+        self.population[worst] = individuals
+        self.totals[worst], self.fitness[worst] = self.evaluate(individuals)
+
+    def apply_best(self, individual: Optional[np.ndarray] = None) -> Board:
+        """ Place the best (or given) individual on the board, cogs that didn't fit go to storage."""
+        if individual is None:
+            individual, _ = self.best()
+        return self.decoder.to_board(individual, self.board, self.cogs)
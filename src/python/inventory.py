@@ -0,0 +1,84 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .cogs import Cog, Player
+from .special_cogs import Adjay, BoostedCog, Collumm, Diggle, Downer, Leff, Omni, Rite, Rowow, Uppy
+
+COG_TYPES = (Cog, Player, Adjay, Diggle, Uppy, Downer, Leff, Rite, Rowow, Collumm, Omni)
+COG_TYPE_NAMES = {cog_type.__name__: kind for kind, cog_type in enumerate(COG_TYPES)}
+
+
+class CogInventory:
+    """ Struct-of-arrays cog container keyed by cog id.
+
+        ids:    (K,) cog ids
+        kind:   (K,) index of cog type in COG_TYPES
+        base:   (K, 3) base build, flaggy and exp
+        mult:   (K, 3) build, flaggy and exp multipliers of boosted cogs, 1 for other cogs
+        span:   (K,) board_width of Rowow and board_height of Collumm cogs, 0 for other cogs
+        names:  player names, None for other cogs
+
+    """
+    def __init__(self, ids: np.ndarray, kind: np.ndarray, base: np.ndarray, mult: np.ndarray, span: np.ndarray,
+                 names: Sequence[Optional[str]]) -> None:
+        self.ids = np.ascontiguousarray(ids, dtype=np.int64)
+        self.kind = np.ascontiguousarray(kind, dtype=np.int8)
+        self.base = np.ascontiguousarray(base, dtype=float).reshape(-1, 3)
+        self.mult = np.ascontiguousarray(mult, dtype=float).reshape(-1, 3)
+        self.span = np.ascontiguousarray(span, dtype=np.int32)
+        self.names = list(names)
+        assert len(self.ids) == len(self.kind) == len(self.base) == len(self.mult) == len(self.span) == len(self.names), \
+            "All inventory arrays should have the same length!"
+        self._positions: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_cogs(cls, cogs: Sequence[Cog], ids: Optional[Sequence[int]] = None) -> 'CogInventory':
+        kind, base, mult, span, names = [], [], [], [], []
+        for cog in cogs:
+            assert type(cog) in COG_TYPES, "Unsupported cog type: " + type(cog).__name__ + "!"
+            kind.append(COG_TYPES.index(type(cog)))
+            base.append((cog._base_build, cog._base_flaggy, cog._base_exp))
+            mult.append((cog.b_mult, cog.f_mult, cog.e_mult) if isinstance(cog, BoostedCog) else (1, 1, 1))
+            span.append(getattr(cog, 'board_width', getattr(cog, 'board_height', 0)))
+            names.append(cog.name if isinstance(cog, Player) else None)
+        ids = np.arange(len(kind)) if ids is None else ids
+        return cls(ids, kind, base, mult, span, names)
+
+    def position(self, cog_id: int) -> int:
+        """ Row of the cog with given id."""
+        if self._positions is None:
+            self._positions = {cog_id: i for i, cog_id in enumerate(self.ids.tolist())}
+        return self._positions[cog_id]
+
+    def prototype(self, kind: int, span: int = 0) -> Cog:
+        """ Cog of given type with zero stats, used to look up boost patterns."""
+        cog_type = COG_TYPES[kind]
+        if cog_type is Rowow:
+            return Rowow(board_width=span)
+        if cog_type is Collumm:
+            return Collumm(board_height=span)
+        if cog_type is Player:
+            return Player('')
+        return cog_type()
+
+    def to_cog(self, i: int) -> Cog:
+        """ Cog object built from i-th row."""
+        cog_type = COG_TYPES[self.kind[i]]
+        build, flaggy, exp = self.base[i].tolist()
+        if cog_type is Player:
+            return Player(self.names[i], build, flaggy, exp)
+        if cog_type is Cog:
+            return Cog(build, flaggy, exp)
+        b_mult, f_mult, e_mult = self.mult[i].tolist()
+        if cog_type is Rowow:
+            return Rowow(build, flaggy, exp, b_mult, f_mult, e_mult, board_width=int(self.span[i]))
+        if cog_type is Collumm:
+            return Collumm(build, flaggy, exp, b_mult, f_mult, e_mult, board_height=int(self.span[i]))
+        return cog_type(build, flaggy, exp, b_mult, f_mult, e_mult)
+
+    def to_cogs(self) -> List[Cog]:
+        return [self.to_cog(i) for i in range(len(self))]
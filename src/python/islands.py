@@ -0,0 +1,145 @@
+import multiprocessing as mp
+import pickle
+import queue
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .board import Board
+from .cogs import Cog
+from .genetic_algorithm import Idleon_Genetic_Algorithm
+
+
+def _island(index: int, board: Board, cogs: Sequence[Cog], seed: int, generations: int, time_budget: Optional[float],
+            migration_interval: int, migrants: int, inbox: mp.Queue, outbox: mp.Queue, results: mp.Queue,
+            ga_kwargs: Dict[str, Any]) -> None:
+    """ Run an island, an exception is sent to the driver through results instead of being lost."""
+    try:
+        _evolve(index, board, cogs, seed, generations, time_budget, migration_interval, migrants, inbox, outbox,
+                results, ga_kwargs)
+    except Exception as error:
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(repr(error))
+        outbox.cancel_join_thread()
+        results.put({'island': index, 'error': error, 'traceback': traceback.format_exc()})
+
+
+def _evolve(index: int, board: Board, cogs: Sequence[Cog], seed: int, generations: int, time_budget: Optional[float],
+            migration_interval: int, migrants: int, inbox: mp.Queue, outbox: mp.Queue, results: mp.Queue,
+            ga_kwargs: Dict[str, Any]) -> None:
+    """ Evolve one island, send its best individuals to the next island every migration_interval generations."""
+    start = time.perf_counter()
+    algorithm = Idleon_Genetic_Algorithm(board, cogs, seed=seed, generations=generations, **ga_kwargs)
+    algorithm.initialize()
+    sent = received = 0
+    while algorithm.generation < generations:
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            break
+        algorithm.step()
+        if algorithm.generation % migration_interval == 0:
+            outbox.put(algorithm.top(migrants))
+            sent += 1
+            while True:
+                try:
+                    algorithm.immigrate(inbox.get_nowait())
+                    received += 1
+                except queue.Empty:
+                    break
+    algorithm.close()
+    outbox.cancel_join_thread()
+    individual, fitness = algorithm.best()
+    results.put({
+        'island': index,
+        'best': individual,
+        'best_fitness': fitness,
+        'generations': algorithm.generation,
+        'history': algorithm.history,
+        'migrations_sent': sent,
+        'migrations_received': received,
+        'elapsed': time.perf_counter() - start,
+    })
+
+
+class IslandModel:
+    """ Island model on top of Idleon_Genetic_Algorithm.
+
+        Every island is a separate population evolving in its own process. Every migration_interval
+        generations an island sends copies of its migrants best individuals to the next island in a ring,
+        where they replace the weakest individuals. Other keyword arguments are passed to every island's
+        Idleon_Genetic_Algorithm, per-island statistics are available in island_stats after run.
+
+        When an island raises, the other islands are terminated and run raises the island's exception
+        (its traceback in the island process is attached as the cause). An island process dying without
+        a result raises RuntimeError. The driver checks on the islands every poll_interval seconds.
+    """
+    poll_interval = 0.5
+
+    def __init__(self, board: Board, cogs: Sequence[Cog], islands: int = 4, migration_interval: int = 10,
+                 migrants: int = 2, generations: int = 100, time_budget: Optional[float] = None,
+                 seed: Optional[int] = None, **ga_kwargs) -> None:
+        assert islands >= 1, "There should be at least one island!"
+        assert migration_interval >= 1, "Migration interval should be at least one generation!"
+        self.board = board
+        self.cogs = list(cogs)
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.generations = generations
+        self.time_budget = time_budget
+        self.seed = seed
+        self.ga_kwargs = ga_kwargs
+        self.island_stats: List[Dict[str, Any]] = []
+
+    def run(self) -> Tuple[np.ndarray, float]:
+        """ Evolve all islands, return the best individual found on any island and its fitness."""
+        seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(self.seed).spawn(self.islands)]
+        context = mp.get_context()
+        inboxes = [context.Queue() for _ in range(self.islands)]
+        results = context.Queue()
+        processes = [
+            context.Process(target=_island, args=(
+                i, self.board, self.cogs, seeds[i], self.generations, self.time_budget, self.migration_interval,
+                self.migrants, inboxes[i], inboxes[(i + 1) % self.islands], results, self.ga_kwargs))
+            for i in range(self.islands)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            self.island_stats = sorted(self._collect(processes, results), key=lambda stats: stats['island'])
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+        return self.best()
+
+    def _collect(self, processes: List[mp.Process], results: mp.Queue) -> List[Dict[str, Any]]:
+        """ Statistics of every island, raises as soon as an island failed."""
+        collected = []
+        while len(collected) < len(processes):
+            try:
+                stats = results.get(timeout=self.poll_interval)
+            except queue.Empty:
+                for i, process in enumerate(processes):
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError("Island " + str(i) + " exited with code " + str(process.exitcode) + "!")
+                continue
+            if 'error' in stats:
+                raise stats['error'] from RuntimeError("Island " + str(stats['island']) + " failed:\n" + stats['traceback'])
+            collected.append(stats)
+        return collected
+
+    def best(self) -> Tuple[np.ndarray, float]:
+        stats = max(self.island_stats, key=lambda stats: stats['best_fitness'])
+        return stats['best'], stats['best_fitness']
+
+    def apply_best(self) -> Board:
+        """ Place the best individual on the board, cogs that didn't fit go to storage."""
+        individual, _ = self.best()
+        return Idleon_Genetic_Algorithm(self.board, self.cogs, **self.ga_kwargs).apply_best(individual)
@@ -0,0 +1,116 @@
+import math
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .board import Board
+from .profiling import PROFILER
+
+
+class LocalSearch:
+    """ Simulated annealing with a tabu list over the layout currently on a Board.
+
+        Moves are swapping cogs of two unlocked cells (moving a cog to an empty cell included) and swapping
+        a cell with a cog from storage. Every move is scored with Board.delta_swap / Board.delta_place,
+        so an iteration costs only the cells inside the touched boost footprints.
+
+        Worse moves are accepted with probability exp(delta / temperature), temperature is multiplied by
+        cooling every iteration. Cells changed by a move are tabu for tabu_tenure iterations, unless the
+        move gives a new best layout. After patience iterations without improvement the search restarts
+        from the best layout with the initial temperature, at most restarts times.
+        The board is left with the best layout found.
+    """
+    def __init__(self, board: Board, weights: Tuple[float, float, float] = (1, 1, 1), time_budget: float = 1.0,
+                 max_iterations: Optional[int] = None, initial_temperature: Optional[float] = None,
+                 cooling: float = 0.999, tabu_tenure: int = 5, restarts: int = 3, patience: int = 2000,
+                 storage_move_rate: float = 0.2, seed: Optional[int] = None) -> None:
+        self.board = board
+        self.weights = np.asarray(weights, dtype=float)
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.initial_temperature = initial_temperature
+        self.cooling = cooling
+        self.tabu_tenure = tabu_tenure
+        self.restarts = restarts
+        self.patience = patience
+        self.storage_move_rate = storage_move_rate
+        self.rng = np.random.default_rng(seed)
+        self.cells = np.flatnonzero(np.asarray(board.mask).astype(bool))
+        self.iterations = 0
+        self.accepted = 0
+        self.improvements = 0
+        self.restarts_done = 0
+
+    def _random_move(self) -> Tuple[np.ndarray, Tuple[int, ...], Optional[int]]:
+        """ Apply a random pending move, return its delta, changed cells and used storage index."""
+        width = self.board.board.shape[1]
+        if self.board.storage and self.rng.random() < self.storage_move_rate:
+            cell = int(self.cells[self.rng.integers(len(self.cells))])
+            stored = int(self.rng.integers(len(self.board.storage)))
+            return np.array(self.board.delta_place(cell % width, cell // width, self.board.storage[stored])), (cell,), stored
+        i, j = self.rng.integers(len(self.cells)), self.rng.integers(len(self.cells) - 1)
+        a, b = int(self.cells[i]), int(self.cells[j + (j >= i)])
+        return np.array(self.board.delta_swap((a % width, a // width), (b % width, b // width))), (a, b), None
+
+    def _estimate_temperature(self, samples: int = 50) -> float:
+        """ Mean absolute weighted delta of random moves."""
+        deltas = []
+        for _ in range(samples):
+            delta, _, _ = self._random_move()
+            self.board.rollback()
+            deltas.append(abs(float(delta @ self.weights)))
+        return float(np.mean(deltas)) or 1.0
+
+    def run(self) -> float:
+        """ Search until time budget or iteration limit is reached, return weighted value of the best layout."""
+        start = time.perf_counter()
+        self.board.calculate_board()
+        if len(self.cells) < 2:
+            return float(np.array(self.board.get_totals()) @ self.weights)
+        value = best_value = float(np.array(self.board.get_totals(), dtype=float) @ self.weights)
+        best = self.board.snapshot()
+        temperature = initial_temperature = self.initial_temperature or self._estimate_temperature()
+        tabu = {}
+        stale = 0
+        while time.perf_counter() - start < self.time_budget:
+            if self.max_iterations is not None and self.iterations >= self.max_iterations:
+                break
+            self.iterations += 1
+            delta, cells, stored = self._random_move()
+            delta_value = float(delta @ self.weights)
+            aspiration = value + delta_value > best_value
+            if not aspiration and any(tabu.get(cell, 0) > self.iterations for cell in cells):
+                self.board.rollback()
+                continue
+            if delta_value >= 0 or self.rng.random() < math.exp(delta_value / max(temperature, 1e-12)):
+                if stored is not None:
+                    self.board.storage.pop(stored)
+                self.board.commit()
+                self.accepted += 1
+                value += delta_value
+                for cell in cells:
+                    tabu[cell] = self.iterations + self.tabu_tenure
+            else:
+                self.board.rollback()
+            temperature *= self.cooling
+            if value > best_value + 1e-9 * abs(best_value):
+                best_value = value
+                best = self.board.snapshot()
+                self.improvements += 1
+                stale = 0
+            else:
+                stale += 1
+            if stale >= self.patience and self.restarts_done < self.restarts:
+                self.board.restore(best)
+                value = best_value
+                temperature = initial_temperature
+                tabu.clear()
+                stale = 0
+                self.restarts_done += 1
+        self.board.restore(best)
+        self.board.calculate_board()
+        if PROFILER.enabled:
+            PROFILER.count('local_search.iterations', self.iterations)
+            PROFILER.add_time('local_search.run', time.perf_counter() - start)
+        return float(np.array(self.board.get_totals(), dtype=float) @ self.weights)
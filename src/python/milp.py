@@ -0,0 +1,159 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, milp
+from scipy.sparse import csr_matrix
+
+from .board import Board
+from .cogs import Cog
+from .encoding import LayoutSolution
+from .evaluator import EMPTY, NO_PATTERN, boost_target_table, encode_catalogue
+
+
+class _Program:
+    """ Variables and sparse constraint rows of a mixed integer linear program under construction."""
+    def __init__(self) -> None:
+        self.lower: List[float] = []
+        self.upper: List[float] = []
+        self.integral: List[int] = []
+        self.rows: List[int] = []
+        self.columns: List[int] = []
+        self.values: List[float] = []
+        self.row_lower: List[float] = []
+        self.row_upper: List[float] = []
+        self.objective: List[Tuple[Sequence[int], Sequence[float]]] = []
+
+    def variables(self, count: int, lower: float, upper: float, integral: bool = False) -> np.ndarray:
+        start = len(self.lower)
+        self.lower += [lower] * count
+        self.upper += [upper] * count
+        self.integral += [int(integral)] * count
+        return np.arange(start, start + count)
+
+    def constrain(self, columns: Sequence[int], values: Sequence[float], lower: float, upper: float) -> None:
+        """ lower <= sum(values * variables[columns]) <= upper"""
+        row = len(self.row_lower)
+        self.rows += [row] * len(columns)
+        self.columns += list(columns)
+        self.values += list(values)
+        self.row_lower.append(lower)
+        self.row_upper.append(upper)
+
+    def maximize(self, columns: Sequence[int], values: Sequence[float]) -> None:
+        """ Add values * variables[columns] to the objective."""
+        self.objective.append((columns, values))
+
+    def solve(self, options: dict):
+        objective = np.zeros(len(self.lower))
+        for columns, values in self.objective:
+            np.add.at(objective, np.asarray(columns, dtype=np.intp), values)
+        matrix = csr_matrix((self.values, (self.rows, self.columns)), shape=(len(self.row_lower), len(self.lower)))
+        return milp(-objective, integrality=np.array(self.integral), bounds=Bounds(self.lower, self.upper),
+                     constraints=LinearConstraint(matrix, self.row_lower, self.row_upper), options=options)
+
+
+class MILPSolver(LayoutSolution):
+    """ Exact cog placement as a mixed integer linear program solved by HiGHS (scipy.optimize.milp).
+
+        Binary x[i, c] places cog i in unlocked cell c, every cog and every cell are used at most once.
+        Build and flaggy of every cell are chained through the boosted cogs able to reach it: the chain
+        starts at the base value of the cell's cog, and boosted cog k multiplies it by its mult when k sits
+        in a cell boosting this one. Every link is the product of a binary and a bounded continuous
+        variable, which four linear constraints describe exactly, so unlike a log or piecewise model the
+        optimum of the program is the optimal layout. Exp is never boosted and stays linear in x.
+
+        After solve: optimal is True when HiGHS proved optimality within time_limit (up to mip_rel_gap),
+        gap is the relative gap it reported, bound its upper bound on the weighted value and status and
+        message come from scipy.optimize.milp.
+    """
+    def __init__(self, board: Board, cogs: Sequence[Cog], weights: Tuple[float, float, float] = (1, 1, 1),
+                 time_limit: Optional[float] = None, mip_rel_gap: float = 1e-6) -> None:
+        self.board = board
+        self.cogs = list(cogs)
+        self.weights = np.asarray(weights, dtype=float)
+        self.time_limit = time_limit
+        self.mip_rel_gap = mip_rel_gap
+        self.mask = np.asarray(board.mask).astype(bool)
+        self.cells = np.flatnonzero(self.mask)
+        self.catalogue = encode_catalogue(self.cogs)
+        self.tables = [boost_target_table(offsets, self.mask) for offsets in self.catalogue.patterns]
+        self.optimal = False
+        self.gap = np.inf
+        self.bound = np.inf
+        self.status = None
+        self.message = ''
+        self.best_value = -np.inf
+        self.best_layout: Optional[np.ndarray] = None
+
+    def _sources(self, cog: int) -> List[List[int]]:
+        """ Positions (in self.cells) from which the cog boosts every unlocked cell, by position."""
+        indptr, indices = self.tables[self.catalogue.pattern[cog]]
+        position = np.full(self.mask.size, -1, dtype=np.intp)
+        position[self.cells] = np.arange(len(self.cells))
+        sources: List[List[int]] = [[] for _ in self.cells]
+        for source, cell in enumerate(self.cells.tolist()):
+            for target in indices[indptr[cell]:indptr[cell + 1]].tolist():
+                sources[position[target]].append(source)
+        return sources
+
+    def build(self) -> Tuple[_Program, np.ndarray]:
+        """ Program and (cogs, cells) indices of its placement variables."""
+        program = _Program()
+        count, size = len(self.cogs), len(self.cells)
+        x = program.variables(count * size, 0, 1, integral=True).reshape(count, size)
+        for i in range(count):
+            program.constrain(x[i], np.ones(size), -np.inf, 1)
+        for c in range(size):
+            program.constrain(x[:, c], np.ones(count), -np.inf, 1)
+        base = self.catalogue.base[:-1]
+        program.maximize(x.ravel(), np.repeat(base[:, 2] * self.weights[2], size))
+        boosted = [k for k in range(count) if self.catalogue.pattern[k] != NO_PATTERN]
+        sources = {k: self._sources(k) for k in boosted}
+        for channel in range(2):
+            if self.weights[channel] == 0:
+                continue
+            chain = [k for k in boosted if self.catalogue.mult[k, channel] != 1]
+            for c in range(size):
+                links = [(k, sources[k][c]) for k in chain if sources[k][c]]
+                if not links:
+                    program.maximize(x[:, c], base[:, channel] * self.weights[channel])
+                    continue
+                lower, upper = min(base[:, channel].min(), 0.0), max(base[:, channel].max(), 0.0)
+                value = program.variables(1, lower, upper)[0]
+                program.constrain(np.concatenate(([value], x[:, c])), np.concatenate(([1.0], -base[:, channel])), 0, 0)
+                for k, cells in links:
+                    mult = self.catalogue.mult[k, channel]
+                    boosted_lower, boosted_upper = min(lower, lower * mult), max(upper, upper * mult)
+                    link, boosted_value = program.variables(2, boosted_lower, boosted_upper)
+                    y = x[k, cells]
+                    # link = value * y for binary y = (k is in a cell boosting c), boosted_value = value * mult**y
+                    program.constrain(np.concatenate(([link], y)), np.concatenate(([1.0], -upper * np.ones(len(y)))), -np.inf, 0)
+                    program.constrain(np.concatenate(([link], y)), np.concatenate(([1.0], -lower * np.ones(len(y)))), 0, np.inf)
+                    program.constrain(np.concatenate(([link, value], y)), np.concatenate(([1.0, -1.0], -lower * np.ones(len(y)))), -np.inf, -lower)
+                    program.constrain(np.concatenate(([link, value], y)), np.concatenate(([1.0, -1.0], -upper * np.ones(len(y)))), -upper, np.inf)
+                    program.constrain([boosted_value, value, link], [1.0, -1.0, 1.0 - mult], 0, 0)
+                    value, lower, upper = boosted_value, boosted_lower, boosted_upper
+                program.maximize([value], [self.weights[channel]])
+        return program, x
+
+    def solve(self) -> Tuple[np.ndarray, float]:
+        """ Best layout of cog indices (EMPTY for empty cells) and its weighted value."""
+        layout = np.full(self.mask.size, EMPTY, dtype=np.intp)
+        self.optimal, self.gap, self.bound = True, 0.0, 0.0
+        if len(self.cogs) and len(self.cells):
+            program, x = self.build()
+            options = {'disp': False, 'mip_rel_gap': self.mip_rel_gap}
+            if self.time_limit is not None:
+                options['time_limit'] = self.time_limit
+            result = program.solve(options)
+            self.status, self.message = result.status, result.message
+            self.optimal = result.status == 0
+            self.gap = float(getattr(result, 'mip_gap', np.inf) if result.x is not None else np.inf)
+            dual_bound = getattr(result, 'mip_dual_bound', None)
+            self.bound = -float(dual_bound) if dual_bound is not None else np.inf
+            if result.x is not None:
+                cogs, cells = np.nonzero(result.x[x] > 0.5)
+                layout[self.cells[cells]] = cogs
+        self.best_layout = layout.reshape(self.mask.shape)
+        self.best_value = float(self.totals() @ self.weights)
+        return self.best_layout, self.best_value
@@ -0,0 +1,84 @@
+""" Population level genetic operators on (N, L) permutation arrays.
+
+Every operator handles the whole population with a few array calls, randomness comes from a
+numpy.random.Generator, and children of permutations are always permutations.
+"""
+import numpy as np
+
+
+def tournament_select(fitness: np.ndarray, count: int, size: int, rng: np.random.Generator) -> np.ndarray:
+    """ Indices of count tournament winners, each tournament between size random individuals."""
+    contestants = rng.integers(0, len(fitness), (count, size))
+    return contestants[np.arange(count), np.argmax(fitness[contestants], axis=1)]
+
+
+def _segments(count: int, length: int, rng: np.random.Generator) -> np.ndarray:
+    """ (count, length) mask of a random segment [start, stop) in every row."""
+    start, stop = np.sort(rng.integers(0, length + 1, (2, count)), axis=0)
+    positions = np.arange(length)
+    return (positions >= start[:, None]) & (positions < stop[:, None])
+
+
+def _members(parents: np.ndarray, segment: np.ndarray) -> np.ndarray:
+    """ (N, L) mask of genes (by value) lying in the segment of every row."""
+    members = np.zeros(parents.shape, dtype=bool)
+    members[np.arange(len(parents))[:, None], parents] = segment
+    return members
+
+
+def order_crossover(parents_a: np.ndarray, parents_b: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """ Order crossover: segment of the first parent, remaining genes in order of the second parent."""
+    segment = _segments(len(parents_a), parents_a.shape[1], rng)
+    rest = ~_members(parents_a, segment)[np.arange(len(parents_b))[:, None], parents_b]
+    children = np.where(segment, parents_a, 0)
+    # both masks have the same count per row, so row-major order pairs every row with itself
+    children[~segment] = parents_b[rest]
+    return children
+
+
+def pmx_crossover(parents_a: np.ndarray, parents_b: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """ Partially mapped crossover: segment of the first parent, other positions from the second parent
+        with genes already in the segment replaced through the segment mapping.
+    """
+    rows = np.arange(len(parents_a))[:, None]
+    segment = _segments(len(parents_a), parents_a.shape[1], rng)
+    members = _members(parents_a, segment)
+    position_a = np.empty_like(parents_a)
+    position_a[rows, parents_a] = np.arange(parents_a.shape[1])
+    genes = parents_b.copy()
+    conflict = ~segment & members[rows, genes]
+    while conflict.any():
+        genes = np.where(conflict, parents_b[rows, position_a[rows, genes]], genes)
+        conflict = ~segment & members[rows, genes]
+    return np.where(segment, parents_a, genes)
+
+
+def swap_mutation(population: np.ndarray, rate: float, rng: np.random.Generator) -> np.ndarray:
+    """ Swap two random genes of every row with probability rate, in place."""
+    rows = np.flatnonzero(rng.random(len(population)) < rate)
+    i, j = rng.integers(0, population.shape[1], (2, len(rows)))
+    population[rows, i], population[rows, j] = population[rows, j], population[rows, i]
+    return population
+
+
+def insert_mutation(population: np.ndarray, rate: float, rng: np.random.Generator) -> np.ndarray:
+    """ Move a random gene to a random position of every row with probability rate, in place."""
+    rows = np.flatnonzero(rng.random(len(population)) < rate)
+    i, j = rng.integers(0, population.shape[1], (2, len(rows)))
+    positions = np.arange(population.shape[1])
+    i, j = i[:, None], j[:, None]
+    source = positions + ((positions >= i) & (positions < j)) - ((positions > j) & (positions <= i))
+    source = np.where(positions == j, i, source)
+    population[rows] = np.take_along_axis(population[rows], source, axis=1)
+    return population
+
+
+CROSSOVERS = {
+    'order': order_crossover,
+    'pmx': pmx_crossover,
+}
+
+MUTATIONS = {
+    'swap': swap_mutation,
+    'insert': insert_mutation,
+}
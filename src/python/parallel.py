@@ -0,0 +1,59 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from .evaluator import CatalogueArrays, evaluate_population
+
+_worker_catalogue: Optional[CatalogueArrays] = None
+_worker_mask: Optional[np.ndarray] = None
+
+
+def _init_worker(catalogue: CatalogueArrays, mask: np.ndarray) -> None:
+    global _worker_catalogue, _worker_mask
+    _worker_catalogue = catalogue
+    _worker_mask = mask
+
+
+def _score_chunk(layouts: np.ndarray) -> np.ndarray:
+    return evaluate_population(layouts, _worker_catalogue, _worker_mask)
+
+
+def compact_layouts(layouts: np.ndarray, catalogue_size: int) -> np.ndarray:
+    """ Layouts cast to the smallest integer type able to hold catalogue indices."""
+    dtype = np.int16 if catalogue_size < np.iinfo(np.int16).max else np.int32
+    return np.ascontiguousarray(layouts, dtype=dtype)
+
+
+class ParallelScorer:
+    """ Population scorer spreading evaluate_population over a process pool.
+
+        Catalogue and mask are sent once to every worker at pool initialisation, afterwards only
+        compact integer layouts and (N, 3) totals cross the process boundary. Chunks are gathered
+        in population order, so scores are exactly the ones of the serial path.
+    """
+    def __init__(self, catalogue: CatalogueArrays, mask: np.ndarray, workers: int = 2, chunks_per_worker: int = 1) -> None:
+        assert workers >= 1, "There should be at least one worker!"
+        self.catalogue = catalogue
+        self.mask = np.asarray(mask).astype(bool)
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        self._executor = None
+
+    def __call__(self, layouts: np.ndarray) -> np.ndarray:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.catalogue, self.mask))
+        layouts = compact_layouts(layouts, len(self.catalogue.base))
+        chunks = np.array_split(layouts, min(len(layouts), self.workers * self.chunks_per_worker) or 1)
+        return np.concatenate(list(self._executor.map(_score_chunk, chunks)))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'ParallelScorer':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
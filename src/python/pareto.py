@@ -0,0 +1,121 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .board import Board
+from .cogs import Cog
+from .genetic_algorithm import Idleon_Genetic_Algorithm
+
+
+def _dominator_counts(dominators: np.ndarray, points: np.ndarray, block_size: int) -> np.ndarray:
+    """ Number of dominators at least as good as every point in every objective, block_size dominators at a time."""
+    counts = np.zeros(len(points), dtype=np.intp)
+    for start in range(0, len(dominators), block_size):
+        block = np.ones((len(dominators[start:start + block_size]), len(points)), dtype=bool)
+        for m in range(points.shape[1]):
+            block &= dominators[start:start + block_size, m, None] >= points[None, :, m]
+        counts += block.sum(axis=0)
+    return counts
+
+
+def non_dominated_sort(objectives: np.ndarray, block_size: int = 1024) -> np.ndarray:
+    """ Pareto front rank of every point, 0 for non-dominated ones, all objectives maximized.
+
+        Equal points are merged first, so a distinct point dominates another exactly when it is at least as
+        good in every objective. Dominator counts are accumulated over blocks of block_size points and fronts
+        are peeled off by subtracting the counts of every front from the remaining points, so no more than
+        block_size x points comparisons are held at once.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    unique, inverse = np.unique(objectives, axis=0, return_inverse=True)
+    counts = _dominator_counts(unique, unique, block_size) - 1
+    ranks = np.full(len(unique), -1, dtype=np.intp)
+    remaining = np.arange(len(unique))
+    rank = 0
+    while len(remaining):
+        front = counts[remaining] == 0
+        ranks[remaining[front]] = rank
+        dominators, remaining = unique[remaining[front]], remaining[~front]
+        counts[remaining] -= _dominator_counts(dominators, unique[remaining], block_size)
+        rank += 1
+    return ranks[inverse.reshape(-1)]
+
+
+def crowding_distance(objectives: np.ndarray, ranks: Optional[np.ndarray] = None) -> np.ndarray:
+    """ NSGA-II crowding distance of every point within its front, inf for boundary points."""
+    objectives = np.asarray(objectives, dtype=float)
+    ranks = np.zeros(len(objectives), dtype=np.intp) if ranks is None else np.asarray(ranks)
+    distance = np.zeros(len(objectives))
+    if len(objectives) == 0:
+        return distance
+    for m in range(objectives.shape[1]):
+        order = np.lexsort((objectives[:, m], ranks))
+        values = objectives[order, m]
+        fronts = ranks[order]
+        changes = fronts[1:] != fronts[:-1]
+        first = np.concatenate(([True], changes))
+        last = np.concatenate((changes, [True]))
+        front_index = np.cumsum(first) - 1
+        span = (values[last] - values[first])[front_index]
+        gap = np.full(len(values), np.inf)
+        interior = np.flatnonzero(~(first | last))
+        gap[interior] = np.divide(values[interior + 1] - values[interior - 1], span[interior],
+                                  out=np.zeros(len(interior)), where=span[interior] > 0)
+        distance[order] += gap
+    return distance
+
+
+class NSGA2(Idleon_Genetic_Algorithm):
+    """ Multi-objective cog placement over build, flaggy and exp totals.
+
+        Uses the permutation encoding, crossover and mutation of Idleon_Genetic_Algorithm. Every generation
+        parents and children are ranked together by non-dominated sorting and crowding distance and the
+        best population_size of them survive. fitness holds the negated position in that order, so the
+        inherited tournament selection is the crowded comparison of NSGA-II. history holds the size of the
+        first front. weights and objective are not used.
+    """
+    def __init__(self, board: Board, cogs: Sequence[Cog], **kwargs) -> None:
+        super().__init__(board, cogs, **kwargs)
+        self.ranks = None
+
+    def _rank(self, totals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ Front ranks and positions in crowded comparison order, best first."""
+        ranks = non_dominated_sort(totals)
+        order = np.lexsort((-crowding_distance(totals, ranks), ranks))
+        return ranks, order
+
+    def _survive(self, population: np.ndarray, totals: np.ndarray) -> None:
+        ranks, order = self._rank(totals)
+        order = order[:self.population_size]
+        self.population = population[order]
+        self.totals = totals[order]
+        self.ranks = ranks[order]
+        self.fitness = -np.arange(len(order), dtype=float)
+        self.history.append(int(np.count_nonzero(self.ranks == 0)))
+
+    def initialize(self) -> None:
+        population = self.decoder.random_population(self.population_size, self.rng)
+        totals, _ = self.evaluate(population)
+        self.generation = 0
+        self.history = []
+        self._survive(population, totals)
+
+    def _step(self) -> None:
+        children = self.breed(self.population_size)
+        children_totals, _ = self.evaluate(children)
+        self.generation += 1
+        self._survive(np.concatenate((self.population, children)), np.concatenate((self.totals, children_totals)))
+
+    def front(self) -> Tuple[np.ndarray, np.ndarray]:
+        """ Individuals of the first front with distinct totals and their totals."""
+        front = np.flatnonzero(self.ranks == 0)
+        _, first = np.unique(self.totals[front], axis=0, return_index=True)
+        front = front[np.sort(first)]
+        return self.population[front], self.totals[front]
+
+    def best_for(self, weights: Tuple[float, float, float]) -> Tuple[np.ndarray, float]:
+        """ Front individual with the highest weighted totals and its weighted value."""
+        individuals, totals = self.front()
+        values = totals @ np.asarray(weights, dtype=float)
+        i = int(np.argmax(values))
+        return individuals[i], float(values[i])
@@ -0,0 +1,106 @@
+""" Opt-in counters and phase timers of the hot paths.
+
+    from src.python.profiling import PROFILER
+    PROFILER.enable()
+    PROFILER.start_dump('profile.json', interval=5)
+    ...
+    print(PROFILER.snapshot())
+
+Instrumented code checks PROFILER.enabled before doing anything, so a disabled profiler costs one
+attribute lookup per call site.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Profiler:
+    """ Named counters and timers.
+
+        counters:   name -> count, e.g. evaluations, boosts, validate calls, cache hits
+        timers:     name -> [calls, total seconds], e.g. phases of Board.calculate_board, GA generations
+
+    """
+    def __init__(self) -> None:
+        self.enabled = False
+        self.counters: Dict[str, int] = {}
+        self.timers: Dict[str, List[float]] = {}
+        self._start = time.perf_counter()
+        self._dump_thread: Optional[threading.Thread] = None
+        self._dump_stop = threading.Event()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        self.counters = {}
+        self.timers = {}
+        self._start = time.perf_counter()
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, name: str, seconds: float) -> None:
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """ Time the block when enabled."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """ JSON serializable copy of counters and timers."""
+        timers = {name: {'calls': int(calls), 'total': total, 'mean': total / calls}
+                  for name, (calls, total) in self.timers.copy().items()}
+        return {
+            'enabled': self.enabled,
+            'elapsed': time.perf_counter() - self._start,
+            'counters': self.counters.copy(),
+            'timers': timers,
+        }
+
+    def dump(self, path: str) -> None:
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def start_dump(self, path: str, interval: float = 10.0) -> None:
+        """ Write snapshot to path every interval seconds from a background thread, until stop_dump."""
+        self.stop_dump()
+        self._dump_stop.clear()
+
+        def loop() -> None:
+            while not self._dump_stop.wait(interval):
+                self.dump(path)
+            self.dump(path)
+
+        self._dump_thread = threading.Thread(target=loop, name='profiler-dump', daemon=True)
+        self._dump_thread.start()
+
+    def stop_dump(self) -> None:
+        """ Stop periodic dumping, the final snapshot is written before returning."""
+        if self._dump_thread is not None:
+            self._dump_stop.set()
+            self._dump_thread.join()
+            self._dump_thread = None
+
+
+PROFILER = Profiler()
@@ -0,0 +1,144 @@
+""" Streaming loader of account inventories from save export JSON.
+
+Every account is one JSON object:
+
+    {
+        "account": "name",
+        "mask": ["111100", "011110"],
+        "cogs": [
+            {"type": "Cog", "build": 10, "flaggy": 5, "exp": 1},
+            {"type": "Player", "name": "Bob", "build": 100, "flaggy": 50, "exp": 30},
+            {"type": "Adjay", "build": 1, "flaggy": 2, "exp": 3, "b_mult": 1.5, "f_mult": 2, "e_mult": 1},
+            {"type": "Rowow", "b_mult": 2, "span": 6}
+        ],
+        "layout": [[0, 1, null, null, null, null], [null, 2, 3, null, null, null]]
+    }
+
+mask rows are strings of 0/1 or lists of 0/1, type is a name from inventory.COG_TYPES, missing stats
+default to 0, multipliers to 1 and span (board_width of Rowow, board_height of Collumm) to the mask
+width or height. layout is optional and holds indices into cogs, null for empty cells.
+
+Files may hold one account, a JSON array of accounts or JSON lines (any sequence of account objects).
+They are read in chunks and decoded one account at a time, straight into CogInventory arrays.
+"""
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, TextIO, Union
+
+import numpy as np
+
+from .cogs import Player
+from .evaluator import EMPTY
+from .inventory import COG_TYPE_NAMES, COG_TYPES, CogInventory
+from .special_cogs import BoostedCog, Collumm, Rowow
+
+SAVE_EXTENSIONS = ('.json', '.jsonl')
+_BOOSTED_KINDS = np.array([issubclass(cog_type, BoostedCog) for cog_type in COG_TYPES])
+
+
+class AccountRecord(NamedTuple):
+    """ Decoded account.
+
+        account:    account name or id
+        inventory:  all cogs of the account
+        mask:       (H, W) unlocked cells
+        layout:     (H, W) inventory rows placed on the board, EMPTY for empty cells, None if not exported
+
+    """
+    account: str
+    inventory: CogInventory
+    mask: np.ndarray
+    layout: Optional[np.ndarray]
+
+
+def decode_mask(rows: Iterable[Union[str, Iterable[int]]]) -> np.ndarray:
+    mask = np.array([[int(cell) for cell in row] for row in rows], dtype=bool)
+    assert mask.ndim == 2, "Mask rows should have the same length!"
+    return mask
+
+
+def decode_account(record: Dict[str, Any]) -> AccountRecord:
+    """ Decode one account object into arrays."""
+    mask = decode_mask(record['mask'])
+    height, width = mask.shape
+    cogs = record.get('cogs', [])
+    kind = np.empty(len(cogs), dtype=np.int8)
+    base = np.zeros((len(cogs), 3))
+    mult = np.ones((len(cogs), 3))
+    span = np.zeros(len(cogs), dtype=np.int32)
+    names = [None] * len(cogs)
+    for i, cog in enumerate(cogs):
+        assert cog['type'] in COG_TYPE_NAMES, "Unsupported cog type: " + str(cog['type']) + "!"
+        kind[i] = COG_TYPE_NAMES[cog['type']]
+        base[i] = cog.get('build', 0), cog.get('flaggy', 0), cog.get('exp', 0)
+        mult[i] = cog.get('b_mult', 1), cog.get('f_mult', 1), cog.get('e_mult', 1)
+        if kind[i] == COG_TYPE_NAMES[Rowow.__name__]:
+            span[i] = cog.get('span', width)
+        elif kind[i] == COG_TYPE_NAMES[Collumm.__name__]:
+            span[i] = cog.get('span', height)
+        elif kind[i] == COG_TYPE_NAMES[Player.__name__]:
+            names[i] = cog.get('name', '')
+    mult[~_BOOSTED_KINDS[kind]] = 1
+    layout = None
+    if record.get('layout') is not None:
+        layout = np.array([[EMPTY if i is None else i for i in row] for row in record['layout']], dtype=np.intp)
+        assert layout.shape == mask.shape, "Layout shape is different than mask shape!"
+        assert ((layout >= EMPTY) & (layout < len(cogs))).all(), "Layout refers to unknown cogs!"
+    inventory = CogInventory(np.arange(len(cogs)), kind, base, mult, span, names)
+    return AccountRecord(str(record.get('account', '')), inventory, mask, layout)
+
+
+def iter_json_values(file: TextIO, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """ Lazily decode consecutive JSON values of a file: JSON lines or elements of a top-level array."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+    while True:
+        while position < len(buffer) and (buffer[position].isspace() or buffer[position] in ',]'
+                                           or (buffer[position] == '[' and not started)):
+            started = started or buffer[position] == '['
+            position += 1
+        if position < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                if end < len(buffer) or eof:
+                    started = True
+                    position = end
+                    yield value
+                    continue
+        if eof:
+            return
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def save_files(path: str) -> Iterator[str]:
+    """ The file itself or save files in the directory, sorted by name."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(SAVE_EXTENSIONS):
+                yield os.path.join(path, name)
+    else:
+        yield path
+
+
+def iter_accounts(paths: Union[str, Iterable[str]], chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """ Lazily read undecoded account objects from save files or directories of them."""
+    for path in [paths] if isinstance(paths, str) else paths:
+        for file_path in save_files(path):
+            with open(file_path) as f:
+                yield from iter_json_values(f, chunk_size)
+
+
+def load_accounts(paths: Union[str, Iterable[str]], chunk_size: int = 1 << 16) -> Iterator[AccountRecord]:
+    """ Lazily decode accounts from save files or directories of them."""
+    for record in iter_accounts(paths, chunk_size):
+        yield decode_account(record)
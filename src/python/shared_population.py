@@ -0,0 +1,153 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cogs import Cog
+from .evaluator import CatalogueArrays, encode_catalogue, evaluate_population
+from .parallel import compact_layouts
+
+
+class PopulationHandle(NamedTuple):
+    """ Everything a process needs to attach to a SharedPopulation."""
+    layouts_name: str
+    totals_name: str
+    capacity: int
+    shape: Tuple[int, int]
+    dtype: str
+
+
+def _attach(name: str, shared_tracker: bool = True) -> shared_memory.SharedMemory:
+    """ Attach to an existing block without letting a resource tracker unlink it when this process exits.
+
+        The creating process and the processes it starts (fork, spawn or forkserver) share one resource
+        tracker, which already holds the block, so attaching there must not unregister it. Only a process
+        with a tracker of its own (shared_tracker False) unregisters the block it attached to. From Python
+        3.13 the block is simply not tracked.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        block = shared_memory.SharedMemory(name)
+        if not shared_tracker:
+            resource_tracker.unregister(block._name, 'shared_memory')
+        return block
+
+
+class SharedPopulation:
+    """ Layouts (capacity, H, W) of catalogue indices and their totals (capacity, 3) in shared memory.
+
+        The creating process owns the blocks and has to close them, other processes attach with a handle.
+        shared_tracker tells whether an attaching process shares the creator's resource tracker (the
+        creator and processes started by it do, see _attach).
+    """
+    def __init__(self, capacity: int, shape: Tuple[int, int], dtype: type = np.int32,
+                 handle: Optional[PopulationHandle] = None, shared_tracker: bool = True) -> None:
+        self.owner = handle is None
+        if handle is None:
+            dtype = np.dtype(dtype)
+            layouts_size = max(capacity * shape[0] * shape[1] * dtype.itemsize, 1)
+            self._blocks = [shared_memory.SharedMemory(create=True, size=layouts_size),
+                            shared_memory.SharedMemory(create=True, size=max(capacity * 3 * 8, 1))]
+            handle = PopulationHandle(self._blocks[0].name, self._blocks[1].name, capacity, tuple(shape), dtype.str)
+        else:
+            self._blocks = [_attach(handle.layouts_name, shared_tracker), _attach(handle.totals_name, shared_tracker)]
+        self.handle = handle
+        self.layouts = np.ndarray((handle.capacity,) + tuple(handle.shape), dtype=handle.dtype, buffer=self._blocks[0].buf)
+        self.totals = np.ndarray((handle.capacity, 3), dtype=float, buffer=self._blocks[1].buf)
+
+    @classmethod
+    def attach(cls, handle: PopulationHandle, shared_tracker: bool = True) -> 'SharedPopulation':
+        return cls(handle.capacity, handle.shape, handle.dtype, handle, shared_tracker)
+
+    def close(self) -> None:
+        """ Detach, the owner also frees the blocks."""
+        self.layouts = self.totals = None
+        for block in self._blocks:
+            block.close()
+            if self.owner:
+                block.unlink()
+        self._blocks = []
+
+
+_worker_population: Optional[SharedPopulation] = None
+_worker_catalogue: Optional[CatalogueArrays] = None
+_worker_mask: Optional[np.ndarray] = None
+
+
+def _init_worker(handle: PopulationHandle, catalogue: CatalogueArrays, mask: np.ndarray) -> None:
+    global _worker_population, _worker_catalogue, _worker_mask
+    _worker_population = SharedPopulation.attach(handle)
+    _worker_catalogue = catalogue
+    _worker_mask = mask
+
+
+def _score_slice(start: int, stop: int) -> None:
+    population = _worker_population
+    population.totals[start:stop] = evaluate_population(population.layouts[start:stop], _worker_catalogue, _worker_mask)
+
+
+class SharedMemoryScorer:
+    """ Population scorer with layouts and totals in shared memory.
+
+        Layouts are written once into a SharedPopulation, every worker scores its slice in place and
+        only (start, stop) indices cross the process boundary. Catalogue and mask are sent once at
+        pool initialisation. The blocks (and the pool attached to them) are replaced by larger ones when a
+        population exceeds capacity. Scores are exactly the ones of the serial path.
+    """
+    def __init__(self, catalogue: CatalogueArrays, mask: np.ndarray, workers: int = 2, capacity: int = 0,
+                 chunks_per_worker: int = 1) -> None:
+        assert workers >= 1, "There should be at least one worker!"
+        self.catalogue = catalogue
+        self.mask = np.asarray(mask).astype(bool)
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        self.capacity = capacity
+        self.population: Optional[SharedPopulation] = None
+        self._executor = None
+
+    @classmethod
+    def from_board(cls, board, cogs: Sequence[Cog], workers: int = 2, capacity: int = 0) -> 'SharedMemoryScorer':
+        """ Scorer of layouts of given cogs on the board's grid."""
+        return cls(encode_catalogue(cogs), board.mask, workers, capacity)
+
+    def _ensure_capacity(self, count: int) -> None:
+        if self.population is not None and count <= self.population.handle.capacity:
+            return
+        self.close()
+        self.capacity = max(count, self.capacity)
+        dtype = compact_layouts(np.empty(0), len(self.catalogue.base)).dtype
+        self.population = SharedPopulation(self.capacity, self.mask.shape, dtype)
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(self.population.handle, self.catalogue, self.mask))
+
+    def buffer(self, count: int) -> np.ndarray:
+        """ Shared (count, H, W) layouts view, layouts written here are scored without being copied."""
+        self._ensure_capacity(count)
+        return self.population.layouts[:count]
+
+    def __call__(self, layouts: np.ndarray) -> np.ndarray:
+        count = len(layouts)
+        shared = self.buffer(count)
+        if not (isinstance(layouts, np.ndarray) and layouts.ctypes.data == shared.ctypes.data):
+            shared[...] = layouts
+        bounds = np.linspace(0, count, min(count, self.workers * self.chunks_per_worker) + 1).astype(int)
+        starts, stops = bounds[:-1].tolist(), bounds[1:].tolist()
+        if count:
+            list(self._executor.map(_score_slice, starts, stops))
+        return self.population.totals[:count].copy()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.population is not None:
+            self.population.close()
+            self.population = None
+
+    def __enter__(self) -> 'SharedMemoryScorer':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,125 @@
+""" Sparse evaluation engine for large, mostly empty boards.
+
+Only occupied unlocked cells are stored: cogs by (x, y) coordinates, plus sorted occupied x of every
+row and sorted occupied y of every column. Boosts are applied only to occupied cells, straight line
+footprints (Rowow, Collumm) through the row or column index of their source, so evaluation cost grows
+with the number of placed cogs instead of the board size. A Board keeps its SparseBoard (Board.sparse)
+up to date on every change once the engine has used it, so only the first evaluation scans the board.
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cogs import Cog, EmptyCog
+from .special_cogs import BoostedCog
+
+_LINES: Dict[Tuple[Tuple[int, int], ...], Optional[Tuple[int, int]]] = {}
+
+
+def line_reach(key: Tuple[Tuple[int, int], ...]) -> Optional[Tuple[int, int]]:
+    """ (axis, reach) when a footprint boosts every cell up to reach cells away along a row (axis 0) or
+        a column (axis 1), None for other footprints.
+    """
+    if key not in _LINES:
+        _LINES[key] = None
+        for axis in (0, 1):
+            reach = max((abs(offset[axis]) for offset in key), default=0)
+            line = tuple((i, 0) if axis == 0 else (0, i) for i in range(-reach, reach + 1) if i != 0)
+            if reach > 0 and key == line:
+                _LINES[key] = (axis, reach)
+    return _LINES[key]
+
+
+class SparseBoard:
+    """ Cogs of a board kept by coordinates, see module docstring.
+
+        Cogs placed in locked cells are ignored, as in Board.place. Placing EmptyCog empties the cell.
+    """
+    def __init__(self, height: int = 8, width: int = 12, mask: Optional[np.ndarray] = None) -> None:
+        self.height = height
+        self.width = width
+        self.mask = np.ones((height, width), dtype=bool) if mask is None else np.asarray(mask).astype(bool)
+        assert self.mask.shape == (height, width), "Mask shape is different than board shape!"
+        self.cells: Dict[Tuple[int, int], Cog] = {}
+        self.rows: Dict[int, List[int]] = {}
+        self.columns: Dict[int, List[int]] = {}
+
+    @classmethod
+    def from_board(cls, board) -> 'SparseBoard':
+        """ Sparse copy of cogs in unlocked cells of a Board."""
+        height, width = board.board.shape
+        sparse = cls(height, width, board.mask)
+        for i, cog in enumerate(board.board.ravel().tolist()):
+            if not isinstance(cog, EmptyCog):
+                y, x = divmod(i, width)
+                sparse.place(x, y, cog)
+        return sparse
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def get(self, x: int, y: int) -> Cog:
+        return self.cells.get((x, y), EmptyCog())
+
+    def place(self, x: int, y: int, cog: Cog = EmptyCog()) -> Optional[Cog]:
+        """ Put cog in the cell and return the cog it replaced, if any."""
+        if not (0 <= x < self.width and 0 <= y < self.height and self.mask[y, x]):
+            return None
+        assert isinstance(cog, Cog), "You can't place non-cogs on board!"
+        old = self.cells.pop((x, y), None)
+        if old is None and not isinstance(cog, EmptyCog):
+            insort(self.rows.setdefault(y, []), x)
+            insort(self.columns.setdefault(x, []), y)
+        elif old is not None and isinstance(cog, EmptyCog):
+            self._discard(self.rows, y, x)
+            self._discard(self.columns, x, y)
+        if not isinstance(cog, EmptyCog):
+            self.cells[(x, y)] = cog
+        return old
+
+    @staticmethod
+    def _discard(index: Dict[int, List[int]], line: int, position: int) -> None:
+        positions = index[line]
+        del positions[bisect_left(positions, position)]
+        if not positions:
+            del index[line]
+
+    def multipliers(self) -> Dict[Tuple[int, int], List[float]]:
+        """ [build, flaggy] multiplier of every occupied cell."""
+        mults = {xy: [1.0, 1.0] for xy in self.cells}
+        for (x, y), cog in self.cells.items():
+            if not isinstance(cog, BoostedCog):
+                continue
+            key = cog.offsets_key()
+            line = line_reach(key)
+            if line is None:
+                targets = [mults.get((x + dx, y + dy)) for dx, dy in key]
+            elif line[0] == 0:
+                xs = self.rows[y]
+                near = xs[bisect_left(xs, x - line[1]):bisect_right(xs, x + line[1])]
+                targets = [mults[(tx, y)] for tx in near if tx != x]
+            else:
+                ys = self.columns[x]
+                near = ys[bisect_left(ys, y - line[1]):bisect_right(ys, y + line[1])]
+                targets = [mults[(x, ty)] for ty in near if ty != y]
+            for target in targets:
+                if target is not None:
+                    target[0] *= cog.b_mult
+                    target[1] *= cog.f_mult
+        return mults
+
+    def evaluate(self) -> Tuple[float, float, float]:
+        """ Build, flaggy and exp totals."""
+        totals = [0.0, 0.0, 0.0]
+        for xy, (build_mult, flaggy_mult) in self.multipliers().items():
+            build, flaggy, exp = self.cells[xy].get_base_values()
+            totals[0] += build * build_mult
+            totals[1] += flaggy * flaggy_mult
+            totals[2] += exp
+        return totals[0], totals[1], totals[2]
+
+
+def evaluate_board_sparse(board) -> Tuple[float, float, float]:
+    """ Board totals from the SparseBoard kept by the board, see Board.sparse."""
+    return board.sparse.evaluate()
@@ -1,8 +1,16 @@
-from typing import List, Tuple, Union
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 from .cogs import Cog
 
+DEFAULT_HEIGHT = 8
+DEFAULT_WIDTH = 12
+_FOOTPRINTS: Dict[Tuple[type, int, int], Tuple[np.ndarray, Tuple[Tuple[int, int], ...]]] = {}
+
 class BoostedCog(Cog):
+    __slots__ = ('b_mult', 'f_mult', 'e_mult')
+
     def __init__(self, build: int = 0, flaggy: int = 0, exp: int = 0, b_mult: int = 1, f_mult: int = 1, e_mult: int = 1) -> None:
         super().__init__(build, flaggy, exp)
         self.b_mult = b_mult
@@ -10,16 +18,56 @@ class BoostedCog(Cog):
         self.e_mult = e_mult
 
 
-    def boosted(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    def boosted(self) -> Tuple[np.ndarray, Tuple[float, float, float]]:
         """ Boost efficiency in pattern with given values"""
-        return self._boosted_cogs_relative_coordinates(), (self.b_mult, self.f_mult, self.e_mult)
-    
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+        return self.offsets(), (self.b_mult, self.f_mult, self.e_mult)
+
+    @classmethod
+    def footprint(cls, height: int = DEFAULT_HEIGHT, width: int = DEFAULT_WIDTH) -> np.ndarray:
+        """ Read-only (n, 2) relative (dx, dy) offsets boosted by cogs of this class on a board of given size.
+
+            Computed once per (class, height, width) and shared by all instances.
+        """
+        return cls._cached_footprint(height, width)[0]
+
+    @classmethod
+    def footprint_key(cls, height: int = DEFAULT_HEIGHT, width: int = DEFAULT_WIDTH) -> Tuple[Tuple[int, int], ...]:
+        """ Hashable form of footprint, equal for equal footprints of any class."""
+        return cls._cached_footprint(height, width)[1]
+
+    @classmethod
+    def _cached_footprint(cls, height: int, width: int) -> Tuple[np.ndarray, Tuple[Tuple[int, int], ...]]:
+        key = (cls, height, width)
+        cached = _FOOTPRINTS.get(key)
+        if cached is None:
+            key_offsets = tuple((int(dx), int(dy)) for dx, dy in cls._footprint(height, width))
+            offsets = np.array(key_offsets, dtype=np.intp).reshape(-1, 2)
+            offsets.flags.writeable = False
+            cached = _FOOTPRINTS[key] = (offsets, key_offsets)
+        return cached
+
+    def _dimensions(self) -> Tuple[int, int]:
+        """ Board height and width this cog's footprint depends on."""
+        return DEFAULT_HEIGHT, DEFAULT_WIDTH
+
+    def offsets(self) -> np.ndarray:
+        """ Cached footprint of this cog."""
+        return self._cached_footprint(*self._dimensions())[0]
+
+    def offsets_key(self) -> Tuple[Tuple[int, int], ...]:
+        """ Cached hashable footprint of this cog."""
+        return self._cached_footprint(*self._dimensions())[1]
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern."""
         return []
 
 class Adjay(BoostedCog):
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    __slots__ = ()
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern.
         
             0   0   0   0   0
@@ -40,7 +88,10 @@ class Adjay(BoostedCog):
         return '+'
 
 class Diggle(BoostedCog):
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    __slots__ = ()
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern.
         
             0   0   0   0   0
@@ -61,7 +112,10 @@ class Diggle(BoostedCog):
         return 'x'
 
 class Uppy(BoostedCog):
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    __slots__ = ()
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern.
         
             0   1   1   1   0
@@ -84,7 +138,10 @@ class Uppy(BoostedCog):
         return '^'
 
 class Downer(BoostedCog):
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    __slots__ = ()
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern.
         
             0   0   0   0   0
@@ -107,7 +164,10 @@ class Downer(BoostedCog):
         return 'v'
 
 class Leff(BoostedCog):
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    __slots__ = ()
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern.
         
             0   0   0   0   0
@@ -129,7 +189,10 @@ class Leff(BoostedCog):
         return '<'
 
 class Rite(BoostedCog):
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    __slots__ = ()
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern.
         
             0   0   0   0   0
@@ -151,11 +214,17 @@ class Rite(BoostedCog):
         return '>'
 
 class Rowow(BoostedCog):
+    __slots__ = ('board_width',)
+
     def __init__(self, build: int = 0, flaggy: int = 0, exp: int = 0, b_mult: int = 1, f_mult: int = 1, e_mult: int = 1, board_width: int = 12) -> None:
         super().__init__(build, flaggy, exp, b_mult, f_mult, e_mult)
         self.board_width = board_width
 
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    def _dimensions(self) -> Tuple[int, int]:
+        return DEFAULT_HEIGHT, self.board_width
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern.
         
             0   0   0   0   0
@@ -165,16 +234,22 @@ class Rowow(BoostedCog):
             0   0   0   0   0
 
         """
-        return [(i, 0) for i in range(-(self.board_width - 1), self.board_width) if i != 0]
+        return [(i, 0) for i in range(-(width - 1), width) if i != 0]
     def __str__(self) -> str:
         return '='
 
 class Collumm(BoostedCog):
+    __slots__ = ('board_height',)
+
     def __init__(self, build: int = 0, flaggy: int = 0, exp: int = 0, b_mult: int = 1, f_mult: int = 1, e_mult: int = 1, board_height: int = 8) -> None:
         super().__init__(build, flaggy, exp, b_mult, f_mult, e_mult)
         self.board_height = board_height
 
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    def _dimensions(self) -> Tuple[int, int]:
+        return self.board_height, DEFAULT_WIDTH
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern.
 
             0   0   ^   0   0
@@ -184,12 +259,15 @@ class Collumm(BoostedCog):
             0   0   v   0   0
 
         """
-        return [(0, i) for i in range(-(self.board_height - 1), self.board_height) if i != 0]
+        return [(0, i) for i in range(-(height - 1), height) if i != 0]
     def __str__(self) -> str:
         return '|'
 
 class Omni(BoostedCog):
-    def _boosted_cogs_relative_coordinates(self) -> List[Tuple[Union[int, slice], Union[int, slice]]]:
+    __slots__ = ()
+
+    @classmethod
+    def _footprint(cls, height: int, width: int) -> List[Tuple[int, int]]:
         """ Boost efficiency in pattern.
         
             1   0   0   0   1
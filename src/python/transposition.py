@@ -0,0 +1,162 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .cogs import EmptyCog
+from .evaluator import CatalogueArrays, NO_PATTERN, encode_catalogue, evaluate_population, footprint_key
+from .profiling import PROFILER
+from .special_cogs import BoostedCog
+
+NO_SYMMETRY = 'none'
+ROW_SYMMETRY = 'rows'
+FULL_SYMMETRY = 'all'
+
+
+def layout_symmetry(patterns: Iterable[np.ndarray], width: int) -> str:
+    """ Cell permutations that keep the totals of any layout using given boost patterns.
+
+        Without boosted cogs every unlocked cell is interchangeable. When every boost pattern covers its
+        whole row (Rowow spanning the board), the multiplier of a cell depends only on the row it is in,
+        so unlocked cells within a row are interchangeable.
+    """
+    patterns = [np.asarray(offsets).reshape(-1, 2) for offsets in patterns]
+    if not patterns:
+        return FULL_SYMMETRY
+    row = {(dx, 0) for dx in range(-(width - 1), width) if dx != 0}
+    if all(set(map(tuple, offsets.tolist())) == row for offsets in patterns):
+        return ROW_SYMMETRY
+    return NO_SYMMETRY
+
+
+class TranspositionTable:
+    """ Bounded fitness memo of layouts keyed by a canonical form.
+
+        Cogs are replaced by ids of their equivalence class (equal boost pattern, base values and
+        multipliers), locked cells count as empty and cells are sorted within every symmetric group (see
+        layout_symmetry), so layouts differing only by swapped equal cogs share one entry.
+        Least recently used entries are dropped above max_entries.
+    """
+    def __init__(self, max_entries: int = 100000) -> None:
+        assert max_entries >= 1, "Transposition table should hold at least one entry!"
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[float, float, float]]' = OrderedDict()
+        self._classes: Dict[Tuple, int] = {None: 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, float, float]]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if PROFILER.enabled:
+                PROFILER.count('transposition.hits')
+            return self._entries[key]
+        self.misses += 1
+        if PROFILER.enabled:
+            PROFILER.count('transposition.misses')
+        return None
+
+    def put(self, key: Hashable, totals: Tuple[float, float, float]) -> None:
+        self._entries[key] = totals
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def class_id(self, signature: Optional[Tuple]) -> int:
+        """ Id of the equivalence class of cogs with given signature, 0 for empty cells."""
+        return self._classes.setdefault(signature, len(self._classes))
+
+    def catalogue_classes(self, catalogue: CatalogueArrays) -> np.ndarray:
+        """ Class id of every catalogue row, the last (empty) row included."""
+        patterns = [tuple(map(tuple, offsets.tolist())) for offsets in catalogue.patterns]
+        classes = np.zeros(len(catalogue.pattern), dtype=np.int64)
+        for i in range(len(catalogue.pattern) - 1):
+            pattern = patterns[catalogue.pattern[i]] if catalogue.pattern[i] != NO_PATTERN else None
+            classes[i] = self.class_id((pattern, tuple(catalogue.base[i].tolist()), tuple(catalogue.mult[i].tolist())))
+        return classes
+
+    @staticmethod
+    def canonical_keys(classes: np.ndarray, mask: np.ndarray, symmetry: str) -> List[bytes]:
+        """ Keys of (N, H, W) layouts of class ids."""
+        mask = np.asarray(mask).astype(bool)
+        classes = np.where(mask, classes, 0)
+        if symmetry == ROW_SYMMETRY:
+            classes = np.sort(classes, axis=2)
+        elif symmetry == FULL_SYMMETRY:
+            classes = np.sort(classes.reshape(len(classes), -1), axis=1)
+        prefix = np.array(mask.shape).tobytes() + np.packbits(mask).tobytes()
+        return [prefix + row.tobytes() for row in np.ascontiguousarray(classes).reshape(len(classes), -1)]
+
+    def board_key(self, board) -> bytes:
+        """ Canonical key of the layout currently on the board."""
+        signatures = []
+        patterns = set()
+        for cog in board.board.ravel():
+            if isinstance(cog, EmptyCog):
+                signatures.append(None)
+                continue
+            pattern, mult = None, (1.0, 1.0)
+            if isinstance(cog, BoostedCog):
+                pattern, mult = footprint_key(cog), (float(cog.b_mult), float(cog.f_mult))
+                patterns.add(pattern)
+            signatures.append((pattern, tuple(float(value) for value in cog.get_base_values()), mult))
+        classes = np.array([self.class_id(signature) for signature in signatures], dtype=np.int64)
+        symmetry = layout_symmetry([np.array(pattern, dtype=np.intp) for pattern in patterns], board.board.shape[1])
+        return self.canonical_keys(classes.reshape((1,) + board.board.shape), board.mask, symmetry)[0]
+
+
+class MemoizedScorer:
+    """ Population scorer that scores every distinct canonical layout once.
+
+        Drop-in replacement for the scorer of Idleon_Genetic_Algorithm: takes (N, H, W) layouts of
+        catalogue indices and returns (N, 3) totals. Layouts found in the table, and repeats within the
+        batch, are not passed to the wrapped scorer.
+    """
+    def __init__(self, catalogue: CatalogueArrays, mask: np.ndarray, table: Optional[TranspositionTable] = None,
+                 scorer: Optional[Callable[[np.ndarray], np.ndarray]] = None) -> None:
+        self.catalogue = catalogue if isinstance(catalogue, CatalogueArrays) else encode_catalogue(catalogue)
+        self.mask = np.asarray(mask).astype(bool)
+        self.table = table if table is not None else TranspositionTable()
+        self.scorer = scorer or (lambda layouts: evaluate_population(layouts, self.catalogue, self.mask))
+        self.classes = self.table.catalogue_classes(self.catalogue)
+        self.symmetry = layout_symmetry(self.catalogue.patterns, self.mask.shape[1])
+
+    def keys(self, layouts: np.ndarray) -> List[bytes]:
+        return self.table.canonical_keys(self.classes[np.asarray(layouts)], self.mask, self.symmetry)
+
+    def __call__(self, layouts: np.ndarray) -> np.ndarray:
+        layouts = np.asarray(layouts)
+        totals = np.empty((len(layouts), 3))
+        missing: Dict[bytes, List[int]] = {}
+        for i, key in enumerate(self.keys(layouts)):
+            if key in missing:
+                missing[key].append(i)
+                self.table.hits += 1
+                if PROFILER.enabled:
+                    PROFILER.count('transposition.hits')
+                continue
+            cached = self.table.get(key)
+            if cached is None:
+                missing[key] = [i]
+            else:
+                totals[i] = cached
+        if missing:
+            first = [rows[0] for rows in missing.values()]
+            scores = np.asarray(self.scorer(layouts[first]), dtype=float)
+            for (key, rows), score in zip(missing.items(), scores):
+                totals[rows] = score
+                self.table.put(key, tuple(score.tolist()))
+        return totals
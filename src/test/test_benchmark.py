@@ -0,0 +1,20 @@
+import json
+
+from ..python.benchmark import main, reference_board, run_benchmarks
+
+
+def test_reference_board_is_deterministic():
+    first, _ = reference_board(8, 12, 0.5, seed=3)
+    second, _ = reference_board(8, 12, 0.5, seed=3)
+    first.calculate_board()
+    second.calculate_board()
+    assert first.get_totals() == second.get_totals()
+
+
+def test_benchmarks_report_every_board(tmp_path):
+    results = run_benchmarks(sizes=((4, 6),), min_time=0.01, generations=1)
+    assert [(board['height'], board['width'], board['mask']) for board in results['boards']] == [(4, 6, 'sparse'), (4, 6, 'dense')]
+    assert set(results['boards'][0]['calculate_board_per_s']) >= {'object', 'vectorized'}
+    output = tmp_path / 'bench.json'
+    main(['--output', str(output), '--min-time', '0.001', '--generations', '1', '--sizes', '4x6,5x5'])
+    assert len(json.loads(output.read_text())['boards']) == 4
@@ -0,0 +1,49 @@
+import numpy as np
+
+from ..python.bitboard import pack, shift, unpack
+from ..python.board import Board
+from .test_evaluator import _random_board, _scenarios
+
+
+def test_pack_unpack_round_trip_and_shift():
+    rng = np.random.default_rng(0)
+    for height, width in ((8, 12), (3, 64), (4, 70), (2, 130)):
+        cells = rng.random((height, width)) < 0.5
+        rows = pack(cells)
+        assert rows.dtype == np.uint64 and rows.shape == (height, -(-width // 64))
+        assert np.array_equal(unpack(rows, width), cells)
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1), (-3, 2), (width - 1, 0), (1 - width, -1)):
+            expected = np.zeros_like(cells)
+            source = cells[max(-dy, 0):height - max(dy, 0), max(-dx, 0):width - max(dx, 0)]
+            expected[max(dy, 0):height - max(-dy, 0), max(dx, 0):width - max(-dx, 0)] = source
+            assert np.array_equal(unpack(shift(rows, dx, dy) & pack(np.ones_like(cells)), width), expected)
+
+
+def test_bitboard_engine_matches_object_engine():
+    for placements in _scenarios():
+        board = Board(locked=False)
+        for x, y, cog in placements:
+            board.place(x, y, cog)
+        board.calculate_board()
+        expected = board.get_totals()
+        board.calculate_board(engine='bitboard')
+        assert np.allclose(board.get_totals(), expected, rtol=1e-12)
+    rng = np.random.default_rng(2)
+    for height, width in ((8, 12), (8, 12), (5, 17), (3, 64), (4, 70), (3, 130)):
+        board = _random_board(rng, height=height, width=width)
+        board.calculate_board()
+        expected = board.get_totals()
+        board.calculate_board(engine='bitboard')
+        assert np.allclose(board.get_totals(), expected, rtol=1e-12)
+
+
+def test_bitboards_are_built_once_per_mask():
+    rng = np.random.default_rng(3)
+    board = _random_board(rng)
+    bitboards = board.bitboards
+    keys = {cog.offsets_key() for cog in board.board.ravel() if hasattr(cog, 'offsets_key')}
+    assert keys <= set(bitboards._footprints)
+    board.calculate_board(engine='bitboard')
+    assert board.bitboards is bitboards and keys <= set(bitboards._footprints)
+    board.unlock(np.ones((8, 12), dtype=int))
+    assert board.bitboards is not bitboards and board.bitboards.mask.all()
@@ -0,0 +1,94 @@
+import numpy as np
+
+from ..python.board import Board
+from ..python.cogs import Cog, EmptyCog
+from ..python.special_cogs import *
+from .test_evaluator import _random_board, _random_catalogue
+
+
+def _full_totals(board):
+    board.calculate_board()
+    return np.array(board.get_totals(), dtype=float)
+
+
+def test_delta_place_matches_full_calculation():
+    board = Board(locked=False)
+    board.place(5, 5, Cog(300, 200, 100))
+    board.place(3, 5, Cog(30, 20, 10))
+    before = _full_totals(board)
+    delta = board.delta_place(4, 5, Adjay(10, 20, 30, b_mult=1.5, f_mult=2, e_mult=2.5))
+    assert np.allclose(before + delta, (300 * 1.5 + 30 * 1.5 + 10, 200 * 2 + 20 * 2 + 20, 100 + 10 + 30))
+    assert np.allclose(board.get_totals(), before + delta)
+    board.commit()
+    assert np.allclose(_full_totals(board), before + delta)
+
+
+def test_delta_place_commit_puts_cog_in_storage():
+    board = Board(locked=False)
+    board.place(4, 4, Cog(80, 80, 80))
+    board.delta_place(4, 4, Cog(100, 100, 100))
+    board.commit()
+    assert len(board.storage) == 1
+    assert board.storage[0].get_values() == (80, 80, 80)
+
+
+def test_delta_rollback_restores_board_and_totals():
+    board = Board(locked=False)
+    board.place(4, 5, Rowow(13, 24, 1, b_mult=2.5, f_mult=1.5, e_mult=2))
+    board.place(0, 5, Cog(100, 300, 200))
+    board.place(4, 0, Cog(30, 20, 10))
+    before = _full_totals(board)
+    board.delta_swap((4, 5), (4, 0))
+    board.rollback()
+    assert isinstance(board.board[5, 4], Rowow)
+    assert np.allclose(board.get_totals(), before)
+    assert np.allclose(board.delta_place(6, 5, Cog(10, 10, 10)), (25, 15, 10))
+    board.rollback()
+    assert len(board.storage) == 0
+
+
+def test_delta_place_locked_cell_changes_nothing():
+    board = Board()
+    assert board.delta_place(4, 4, Cog(80, 80, 80)) == (0, 0, 0)
+    board.commit()
+    assert board.empty()
+
+
+def test_random_delta_moves_match_full_calculation():
+    rng = np.random.default_rng(4)
+    board = _random_board(rng)
+    unlocked = np.argwhere(board.mask.astype(bool))
+    for step in range(200):
+        before = np.array(board.get_totals(), dtype=float) if step else _full_totals(board)
+        a = unlocked[rng.integers(len(unlocked))]
+        if rng.random() < 0.5:
+            b = unlocked[rng.integers(len(unlocked))]
+            delta = board.delta_swap((a[1], a[0]), (b[1], b[0]))
+        else:
+            delta = board.delta_place(a[1], a[0], _random_catalogue(rng, 1)[0] if rng.random() < 0.8 else EmptyCog())
+        if rng.random() < 0.5:
+            board.commit()
+            expected = _full_totals(board)
+        else:
+            board.rollback()
+            expected = before
+            delta = (0, 0, 0)
+        assert np.allclose(before + delta, expected, rtol=1e-9)
+
+
+def test_marginal_gains_match_delta_place():
+    rng = np.random.default_rng(7)
+    board = _random_board(rng)
+    board.storage = _random_catalogue(rng, 25)
+    weights = (1, 2, 0.5)
+    gains = board.marginal_gains(weights)
+    assert gains.shape == (25,) + board.board.shape
+    for s, cog in enumerate(board.storage):
+        for y in range(board.board.shape[0]):
+            for x in range(board.board.shape[1]):
+                if not board.mask[y, x]:
+                    assert gains[s, y, x] == -np.inf
+                    continue
+                delta = board.delta_place(x, y, cog)
+                board.rollback()
+                assert np.isclose(gains[s, y, x], np.dot(delta, weights))
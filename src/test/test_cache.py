@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+
+from ..python.board import Board
+from ..python.cache import ResultCache, optimize_with_cache
+from ..python.cogs import Cog, Player
+from ..python.special_cogs import *
+
+
+def _inventory():
+    return [Cog(10, 5, 1), Player('a', 50, 50, 50), Adjay(1, 1, 1, b_mult=2, f_mult=2), Cog(20, 20, 2), Cog(3, 3, 3)]
+
+
+def _board():
+    board = Board(3, 4)
+    board.unlock(np.array([[0, 1, 1, 0], [1, 1, 1, 0], [0, 0, 0, 0]]))
+    return board
+
+
+def test_cache_key_ignores_inventory_order(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cogs = _inventory()
+    assert cache.key(_board().mask, cogs, (1, 1, 1)) == cache.key(_board().mask, cogs[::-1], (1, 1, 1))
+    assert cache.key(_board().mask, cogs, (1, 1, 1)) != cache.key(_board().mask, cogs, (1, 0, 1))
+
+
+def test_optimize_with_cache_hit_and_warm_start(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    board, value, source = optimize_with_cache(_board(), _inventory(), cache, time_budget=0.2, seed=0)
+    assert source == 'cold'
+    board, cached_value, source = optimize_with_cache(_board(), _inventory()[::-1], cache, time_budget=0.2, seed=0)
+    assert source == 'hit' and cached_value == value
+    assert np.isclose(sum(board.get_totals()), value)
+    board, warm_value, source = optimize_with_cache(_board(), _inventory() + [Cog(100, 100, 100)], cache, time_budget=0.2, seed=0)
+    assert source == 'warm' and warm_value > value
+    assert len(os.listdir(str(tmp_path))) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=2)
+    board = _board()
+    keys = []
+    for i in range(3):
+        cogs = [Cog(i, i, i)]
+        board.calculate_board()
+        keys.append(cache.put(board, cogs, (1, 1, 1), 0.0))
+        os.utime(os.path.join(str(tmp_path), keys[-1] + '.json'), (i, i))
+    assert sorted(os.listdir(str(tmp_path))) == sorted(key + '.json' for key in keys[1:])
+
+
+def test_nearest_touches_only_returned_entry(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    board = _board()
+    board.place(1, 0, Cog(1, 1, 1))
+    board.calculate_board()
+    keys = [cache.put(board, [Cog(1, 1, 1)], (1, 1, 1), 0.0)]
+    board.place(2, 0, Cog(2, 2, 2))
+    board.calculate_board()
+    keys.append(cache.put(board, [Cog(1, 1, 1), Cog(2, 2, 2)], (1, 1, 1), 0.0))
+    paths = [os.path.join(str(tmp_path), key + '.json') for key in keys]
+    for path in paths:
+        os.utime(path, (1, 1))
+    entry = cache.nearest(board.mask, [Cog(1, 1, 1), Cog(2, 2, 2), Cog(3, 3, 3)], (1, 1, 1))
+    assert len([signature for signature in entry['layout'] if signature is not None]) == 2
+    assert os.path.getmtime(paths[0]) == 1 and os.path.getmtime(paths[1]) > 1
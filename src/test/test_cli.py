@@ -0,0 +1,52 @@
+import json
+
+import numpy as np
+
+from ..python.cli import main, run_batch
+from ..python.evaluator import EMPTY, encode_inventory, evaluate_population
+from ..python.savefile import load_accounts
+from .test_savefile import _account
+
+
+def test_run_batch_writes_results_and_resumes(tmp_path):
+    saves = str(tmp_path / 'saves.jsonl')
+    output = str(tmp_path / 'results.jsonl')
+    with open(saves, 'w') as f:
+        for name in ('a', 'b', 'c'):
+            f.write(json.dumps(_account(name)) + '\n')
+    with open(output, 'w') as f:
+        f.write(json.dumps({'account': 'b'}) + '\n{"account": "c", "val')
+    assert run_batch([saves], output, workers=2, time_budget=0.1, progress=False) == 2
+    with open(output) as f:
+        lines = f.read().splitlines()
+    assert lines[1] == '{"account": "c", "val'
+    results = {result['account']: result for result in map(json.loads, lines[:1] + lines[2:])}
+    assert set(results) == {'a', 'b', 'c'}
+    record = next(load_accounts(saves))
+    result = results['a']
+    layout = np.array([[EMPTY if i is None else i for i in row] for row in result['layout']])
+    totals = evaluate_population(layout[None], encode_inventory(record.inventory), record.mask)[0]
+    assert np.allclose(totals, result['totals'])
+    assert sorted(result['storage'] + layout[layout != EMPTY].tolist()) == list(range(4))
+    assert len(result['players']) == (1 if 1 in layout else 0)
+    main([saves, '--output', output, '--workers', '1', '--time-budget', '0.1', '--quiet'])
+    with open(output) as f:
+        assert len(f.readlines()) == 4
+
+
+def test_run_batch_records_failed_accounts_and_continues(tmp_path):
+    saves = str(tmp_path / 'saves.jsonl')
+    output = str(tmp_path / 'results.jsonl')
+    broken = _account('broken')
+    broken['cogs'].append({'type': 'Gear'})
+    with open(saves, 'w') as f:
+        for account in (_account('a'), broken, _account('b')):
+            f.write(json.dumps(account) + '\n')
+    assert run_batch([saves], output, workers=2, time_budget=0.1, progress=False) == 2
+    with open(output) as f:
+        results = {result['account']: result for result in map(json.loads, f)}
+    assert set(results) == {'a', 'broken', 'b'}
+    assert 'Unsupported cog type' in results['broken']['error'] and 'error' not in results['a']
+    assert run_batch([saves], output, workers=1, time_budget=0.1, progress=False) == 0
+    with open(output) as f:
+        assert [json.loads(line)['account'] for line in f][-1] == 'broken'
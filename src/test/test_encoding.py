@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from ..python.board import Board
+from ..python.cogs import EmptyCog
+from ..python.encoding import LayoutDecoder
+from ..python.evaluator import EMPTY
+from .test_evaluator import _random_catalogue
+
+
+def _check_feasible(decoder, population, layouts):
+    mask = decoder.mask
+    for individual, layout in zip(population, layouts):
+        placed = layout[layout != EMPTY]
+        assert (layout[~mask] == EMPTY).all()
+        assert len(set(placed.tolist())) == len(placed)
+        stored = decoder.storage(individual)
+        assert sorted(placed.tolist() + stored.tolist()) == list(range(decoder.cog_count))
+        assert len(placed) == min(decoder.cog_count, len(decoder.cells))
+
+
+@pytest.mark.parametrize("cog_count", [3, 20, 60])
+def test_decoded_layouts_are_feasible(cog_count):
+    rng = np.random.default_rng(cog_count)
+    mask = rng.random((4, 6)) < 0.8
+    decoder = LayoutDecoder(mask, cog_count)
+    population = decoder.random_population(50, rng)
+    _check_feasible(decoder, population, decoder.decode(population))
+    keys = rng.random((50, decoder.genome_length))
+    _check_feasible(decoder, decoder.keys_to_permutations(keys), decoder.decode_keys(keys))
+
+
+def test_encode_round_trip():
+    rng = np.random.default_rng(1)
+    mask = rng.random((4, 6)) < 0.7
+    for cog_count in [5, 30]:
+        decoder = LayoutDecoder(mask, cog_count)
+        for individual in decoder.random_population(20, rng):
+            layout = decoder.decode(individual[None])[0]
+            encoded = decoder.encode(layout)
+            assert np.array_equal(decoder.decode(encoded[None])[0], layout)
+            assert sorted(encoded.tolist()) == list(range(decoder.genome_length))
+
+
+def test_encode_keeps_stored_cogs_in_storage():
+    layout = np.array([[0, EMPTY], [EMPTY, EMPTY]])
+    with pytest.raises(AssertionError):
+        LayoutDecoder(np.ones((2, 2), dtype=bool), 3).encode(layout)
+    decoder = LayoutDecoder(np.ones((2, 2), dtype=bool), 3, empty_slots=4)
+    encoded = decoder.encode(layout)
+    assert np.array_equal(decoder.decode(encoded[None])[0], layout)
+    assert sorted(decoder.storage(encoded).tolist()) == [1, 2]
+    assert sorted(encoded.tolist()) == list(range(decoder.genome_length))
+
+
+def test_to_board_places_every_cog_once():
+    rng = np.random.default_rng(2)
+    cogs = _random_catalogue(rng, 30)
+    board = Board(4, 6)
+    board.unlock((rng.random((4, 6)) < 0.7).astype(int))
+    decoder = LayoutDecoder(board.mask, len(cogs))
+    individual = decoder.random_population(1, rng)[0]
+    decoder.to_board(individual, board, cogs)
+    on_board = [cog for cog in board.board.ravel() if not isinstance(cog, EmptyCog)]
+    assert len(on_board) == len(decoder.cells)
+    assert sorted(map(id, on_board + board.storage)) == sorted(map(id, cogs))
+    assert np.array_equal(decoder.from_board(board, cogs)[:len(decoder.cells)], individual[:len(decoder.cells)])
+    layout = decoder.decode(individual[None])[0]
+    y, x = np.argwhere(board.mask)[0]
+    board.place(x, y)
+    layout[y, x] = EMPTY
+    decoder = LayoutDecoder(board.mask, len(cogs), empty_slots=len(decoder.cells))
+    assert np.array_equal(decoder.decode(decoder.from_board(board, cogs)[None])[0], layout)
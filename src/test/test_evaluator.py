@@ -0,0 +1,152 @@
+import numpy as np
+
+from ..python.board import Board
+from ..python.cogs import Cog, Player
+from ..python.special_cogs import *
+from ..python.evaluator import EMPTY, board_layout, encode_catalogue, evaluate_population
+
+
+def _scenarios():
+    yield []
+    yield [(4, 4, Cog(50, 40, 30))]
+    yield [(4, 4, Cog(50, 40, 30)), (4, 5, Cog(30, 20, 10))]
+    yield [(4, 4, Player('Test', 100, 100, 100))]
+    yield [(5, 5, Cog(300, 200, 100)), (3, 5, Cog(30, 20, 10)), (4, 6, Cog(50, 50, 50)), (4, 4, Cog(10, 30, 20)),
+           (3, 4, Cog(4, 3, 2)), (4, 5, Adjay(10, 20, 30, b_mult=1.5, f_mult=2, e_mult=2.5))]
+    yield [(3, 4, Cog(100, 300, 200)), (3, 5, Cog(30, 20, 10)), (4, 5, Diggle(25, 33, 17, b_mult=2, f_mult=2.5, e_mult=1.5))]
+    yield [(4, 7, Cog(100, 300, 200)), (4, 3, Cog(30, 20, 10)), (4, 5, Uppy(11, 24, 7, b_mult=2.5, f_mult=1.5, e_mult=2))]
+    yield [(5, 6, Cog(100, 300, 200)), (4, 4, Cog(30, 20, 10)), (4, 5, Downer(12, 25, 8, b_mult=2.5, f_mult=1.5, e_mult=2))]
+    yield [(6, 4, Cog(200, 100, 300)), (2, 6, Cog(50, 40, 60)), (4, 5, Leff(12, 23, 1, b_mult=1.5, f_mult=1.25, e_mult=2))]
+    yield [(6, 5, Cog(200, 100, 300)), (2, 5, Cog(30, 20, 10)), (4, 5, Rite(12, 25, 8, b_mult=2, f_mult=3, e_mult=4))]
+    yield [(0, 5, Cog(100, 300, 200)), (4, 0, Cog(30, 20, 10)), (4, 5, Rowow(13, 24, 1, b_mult=2.5, f_mult=1.5, e_mult=2))]
+    yield [(0, 5, Cog(200, 100, 300)), (4, 0, Cog(50, 40, 60)), (4, 5, Collumm(14, 24, 1, b_mult=1.5, f_mult=1.25, e_mult=2))]
+    yield [(6, 7, Cog(80, 80, 80)), (3, 6, Cog(100, 100, 100)), (4, 5, Omni(12, 25, 8, b_mult=2, f_mult=3, e_mult=4))]
+
+
+def _random_board(rng, height=8, width=12, density=0.7):
+    board = Board(height, width)
+    board.unlock((rng.random((height, width)) < density).astype(int))
+    types = [Cog, Player, Adjay, Diggle, Uppy, Downer, Leff, Rite, Rowow, Collumm, Omni]
+    for y in range(height):
+        for x in range(width):
+            if rng.random() < 0.3:
+                continue
+            cog_type = types[rng.integers(len(types))]
+            stats = rng.integers(0, 100, 3).tolist()
+            if cog_type is Player:
+                board.place(x, y, Player('p', *stats))
+            elif cog_type is Cog:
+                board.place(x, y, Cog(*stats))
+            else:
+                board.place(x, y, cog_type(*stats, *rng.choice([1, 1.25, 1.5, 2], 3).tolist()))
+    return board
+
+
+def test_vectorized_engine_matches_object_engine_on_calculation_scenarios():
+    for placements in _scenarios():
+        board = Board(locked=False)
+        for x, y, cog in placements:
+            board.place(x, y, cog)
+        board.calculate_board()
+        expected = board.get_totals()
+        board.calculate_board(engine='vectorized')
+        assert board.get_totals() == expected
+
+
+def test_vectorized_engine_matches_object_engine_on_random_boards():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        board = _random_board(rng)
+        board.calculate_board()
+        expected = board.get_totals()
+        board.calculate_board(engine='vectorized')
+        assert np.allclose(board.get_totals(), expected, rtol=1e-12)
+
+
+def test_vectorized_engine_custom_board_size():
+    rng = np.random.default_rng(1)
+    board = _random_board(rng, height=5, width=17)
+    board.calculate_board()
+    expected = board.get_totals()
+    board.calculate_board(engine='vectorized')
+    assert np.allclose(board.get_totals(), expected, rtol=1e-12)
+
+
+def _random_catalogue(rng, size):
+    types = [Cog, Player, Adjay, Diggle, Uppy, Downer, Leff, Rite, Rowow, Collumm, Omni]
+    cogs = []
+    for _ in range(size):
+        cog_type = types[rng.integers(len(types))]
+        stats = rng.integers(0, 100, 3).tolist()
+        if cog_type is Player:
+            cogs.append(Player('p', *stats))
+        elif cog_type is Cog:
+            cogs.append(Cog(*stats))
+        else:
+            cogs.append(cog_type(*stats, *rng.choice([1, 1.25, 1.5, 2], 3).tolist()))
+    return cogs
+
+
+def test_evaluate_population_matches_board():
+    rng = np.random.default_rng(2)
+    cogs = _random_catalogue(rng, 40)
+    mask = (rng.random((8, 12)) < 0.8).astype(int)
+    layouts = np.full((10, 8, 12), EMPTY)
+    for layout in layouts:
+        cells = rng.permutation(96)[:40]
+        layout.flat[cells] = rng.permutation(40)
+    totals = evaluate_population(layouts, cogs, mask)
+    assert totals.shape == (10, 3)
+    for layout, total in zip(layouts, totals):
+        board = Board()
+        board.unlock(mask)
+        for (y, x), i in np.ndenumerate(layout):
+            if i != EMPTY:
+                board.place(x, y, cogs[i])
+        board.calculate_board()
+        assert np.allclose(total, board.get_totals(), rtol=1e-12)
+        assert np.array_equal(board_layout(board, cogs), np.where(mask.astype(bool), layout, EMPTY))
+
+
+def test_evaluate_population_chunks():
+    rng = np.random.default_rng(3)
+    cogs = _random_catalogue(rng, 20)
+    layouts = np.stack([np.where(rng.random((8, 12)) < 0.5, rng.integers(0, 20, (8, 12)), EMPTY) for _ in range(7)])
+    mask = np.ones((8, 12))
+    catalogue = encode_catalogue(cogs)
+    assert np.array_equal(evaluate_population(layouts, catalogue, mask, chunk_size=3), evaluate_population(layouts, catalogue, mask))
+
+
+def test_boost_targets_follow_mask_changes():
+    board = Board(locked=False)
+    board.place(4, 5, Adjay(10, 20, 30, b_mult=2, f_mult=2))
+    board.place(5, 5, Cog(100, 100, 100))
+    assert board.boost_targets(board.board[5, 4], 5 * 12 + 4).tolist() == [4 * 12 + 4, 5 * 12 + 3, 5 * 12 + 5, 6 * 12 + 4]
+    board.calculate_board()
+    assert board.get_totals() == (210, 220, 130)
+    mask = np.ones((8, 12))
+    mask[5, 5] = 0
+    board.unlock(mask)
+    assert board.boost_targets(board.board[5, 4], 5 * 12 + 4).tolist() == [4 * 12 + 4, 5 * 12 + 3, 6 * 12 + 4]
+    for engine in ('object', 'vectorized'):
+        board.calculate_board(engine=engine)
+        assert board.get_totals() == (10, 20, 30)
+
+
+def test_mask_is_copied_read_only():
+    mask = np.array([[1, 0, 1]])
+    board = Board(1, 3)
+    board.unlock(mask)
+    board.place(0, 0, Adjay(0, 0, 0, b_mult=2, f_mult=2))
+    mask[0, 1] = 1
+    assert not board.validate(1, 0)
+    try:
+        board.mask[0, 1] = 1
+        assert False, "Mask should be read-only!"
+    except ValueError:
+        pass
+    board.unlock(mask)
+    board.place(1, 0, Cog(10, 10, 10))
+    for engine in ('object', 'vectorized'):
+        board.calculate_board(engine=engine)
+        assert board.get_totals() == (20, 20, 10)
@@ -0,0 +1,67 @@
+import itertools
+
+import numpy as np
+
+from ..python.board import Board
+from ..python.cogs import Cog, Player
+from ..python.evaluator import EMPTY, evaluate_population
+from ..python.exact import BranchAndBoundSolver
+from ..python.special_cogs import *
+
+
+def _brute_force(board, cogs, weights):
+    cells = np.flatnonzero(board.mask)
+    slots = list(range(len(cogs))) + [EMPTY] * len(cells)
+    layouts = []
+    for assignment in set(itertools.permutations(slots, len(cells))):
+        layout = np.full(board.mask.size, EMPTY)
+        layout[cells] = assignment
+        layouts.append(layout.reshape(board.mask.shape))
+    return (evaluate_population(np.stack(layouts), cogs, board.mask) @ np.array(weights)).max()
+
+
+def test_branch_and_bound_matches_brute_force():
+    board = Board(3, 4)
+    board.unlock(np.array([[0, 1, 1, 0], [1, 1, 1, 0], [0, 0, 0, 0]]))
+    cogs = [Cog(10, 5, 1), Player('a', 50, 20, 9), Adjay(1, 2, 3, b_mult=2, f_mult=1.5), Rowow(4, 4, 4, b_mult=1.5, f_mult=2),
+            Cog(30, 1, 1), Diggle(2, 2, 2, b_mult=3, f_mult=1)]
+    weights = (1, 2, 1)
+    solver = BranchAndBoundSolver(board, cogs, weights)
+    layout, value = solver.solve()
+    assert solver.optimal
+    assert np.isclose(value, _brute_force(board, cogs, weights))
+    assert np.isclose(solver.totals() @ np.array(weights), value)
+    board = solver.apply_best()
+    assert np.isclose(np.array(board.get_totals()) @ np.array(weights), value)
+    assert len(board.storage) == 1
+
+
+def test_branch_and_bound_memoizes_equal_boosted_cogs():
+    board = Board(3, 3, locked=False)
+    cogs = [Adjay(1, 1, 1, b_mult=2, f_mult=2), Adjay(1, 1, 1, b_mult=2, f_mult=2), Cog(10, 10, 10), Cog(5, 5, 5)]
+    solver = BranchAndBoundSolver(board, cogs, (1, 1, 0))
+    solver.solve()
+    assert solver.optimal
+    assert solver.memo_hits > 0
+
+
+def test_branch_and_bound_respects_time_limit():
+    board = Board(locked=False)
+    cogs = [cog_type(1, 1, 1, b_mult=2, f_mult=2) for cog_type in (Adjay, Diggle, Uppy, Downer, Leff, Rite)] + \
+        [Cog(i, i, i) for i in range(30)]
+    solver = BranchAndBoundSolver(board, cogs, time_limit=0.2)
+    layout, value = solver.solve()
+    assert not solver.optimal
+    assert layout is not None and value > 0
+
+
+def test_branch_and_bound_node_budget():
+    rng = np.random.default_rng(0)
+    board = Board(5, 5)
+    board.unlock(rng.permutation(25).reshape(5, 5) < 20)
+    cogs = [cog_type(*rng.integers(1, 50, 3).tolist(), b_mult=1.5, f_mult=2) for cog_type in (Adjay, Diggle, Uppy, Downer)] + \
+        [Cog(*rng.integers(1, 100, 3).tolist()) for _ in range(18)]
+    solver = BranchAndBoundSolver(board, cogs)
+    solver.solve()
+    assert solver.optimal
+    assert solver.nodes < 10000
@@ -0,0 +1,70 @@
+import numpy as np
+
+from ..python.board import Board
+from ..python.cogs import Cog, Player
+from ..python.evaluator import EMPTY
+from ..python.genetic_algorithm import Idleon_Genetic_Algorithm
+from ..python.special_cogs import *
+
+
+def _small_problem():
+    board = Board(4, 6)
+    mask = np.zeros((4, 6))
+    mask[1:3, 1:5] = 1
+    board.unlock(mask)
+    cogs = [Cog(10, 5, 1), Cog(20, 1, 2), Player('a', 50, 50, 50), Cog(3, 30, 3),
+            Adjay(1, 1, 1, b_mult=2, f_mult=2), Rowow(1, 1, 1, b_mult=1.5, f_mult=1.5), Cog(7, 7, 7),
+            Player('b', 40, 10, 10), Cog(1, 1, 1), Cog(2, 2, 2)]
+    return board, cogs
+
+
+def test_decoded_layouts_are_valid():
+    board, cogs = _small_problem()
+    algorithm = Idleon_Genetic_Algorithm(board, cogs, population_size=20, seed=0)
+    algorithm.initialize()
+    layouts = algorithm.decode(algorithm.population)
+    assert layouts.shape == (20, 4, 6)
+    assert np.all(layouts[:, ~algorithm.mask] == EMPTY)
+    for layout in layouts:
+        placed = layout[layout != EMPTY]
+        assert len(placed) == 8 and len(set(placed.tolist())) == 8
+
+
+def test_operators_keep_permutations():
+    board, cogs = _small_problem()
+    algorithm = Idleon_Genetic_Algorithm(board, cogs, population_size=20, seed=1)
+    algorithm.initialize()
+    for _ in range(5):
+        algorithm.step()
+        assert np.all(np.sort(algorithm.population, axis=1) == np.arange(algorithm.genome_length))
+
+
+def test_run_improves_and_applies_best():
+    board, cogs = _small_problem()
+    algorithm = Idleon_Genetic_Algorithm(board, cogs, weights=(1, 1, 0), population_size=30, generations=30, seed=2)
+    _, fitness = algorithm.run()
+    assert algorithm.generation == 30
+    assert algorithm.history[-1] >= algorithm.history[0]
+    board = algorithm.apply_best()
+    build, flaggy, _ = board.get_totals()
+    assert np.isclose(build + flaggy, fitness)
+    assert len(board.storage) == 2
+
+
+def test_run_stops_on_time_budget():
+    board, cogs = _small_problem()
+    algorithm = Idleon_Genetic_Algorithm(board, cogs, population_size=10, generations=10 ** 6, time_budget=0.05, seed=3)
+    algorithm.run()
+    assert 0 < algorithm.generation < 10 ** 6
+
+
+def test_parallel_scoring_matches_serial_path():
+    board, cogs = _small_problem()
+    serial = Idleon_Genetic_Algorithm(board, cogs, population_size=16, generations=5, seed=4)
+    parallel = Idleon_Genetic_Algorithm(board, cogs, population_size=16, generations=5, seed=4, workers=2,
+                                        deterministic=True, time_budget=0)
+    serial.run()
+    parallel.run()
+    assert parallel.generation == 5
+    assert np.array_equal(serial.population, parallel.population)
+    assert np.array_equal(serial.fitness, parallel.fitness)
@@ -0,0 +1,48 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from ..python.board import Board
+from ..python.cogs import Cog, EmptyCog, Player
+from ..python.evaluator import EMPTY, encode_catalogue, encode_inventory, evaluate_population
+from ..python.inventory import CogInventory
+from ..python.special_cogs import *
+from .test_evaluator import _random_catalogue
+
+
+def test_cogs_have_no_instance_dict():
+    for cog in [Cog(), Player('p'), EmptyCog(), Adjay(), Rowow(), Collumm(), Omni()]:
+        assert not hasattr(cog, '__dict__')
+
+
+def test_empty_cog_is_shared_and_immutable():
+    assert EmptyCog() is EmptyCog()
+    assert pickle.loads(pickle.dumps(EmptyCog())) is EmptyCog()
+    with pytest.raises(AttributeError):
+        EmptyCog().build = 5
+    board = Board(locked=False)
+    assert all(cog is EmptyCog() for cog in board.board.flatten())
+
+
+def test_inventory_round_trip():
+    rng = np.random.default_rng(5)
+    cogs = _random_catalogue(rng, 30) + [Rowow(1, 2, 3, 2, 2, 2, board_width=5), Collumm(1, 2, 3, board_height=3)]
+    inventory = CogInventory.from_cogs(cogs, ids=np.arange(100, 132))
+    assert len(inventory) == 32
+    assert inventory.position(105) == 5
+    for cog, copy in zip(cogs, inventory.to_cogs()):
+        assert type(copy) is type(cog)
+        assert copy.get_base_values() == cog.get_base_values()
+        if isinstance(cog, BoostedCog):
+            assert np.array_equal(copy.boosted()[0], cog.boosted()[0]) and copy.boosted()[1] == cog.boosted()[1]
+
+
+def test_inventory_catalogue_matches_cog_catalogue():
+    rng = np.random.default_rng(6)
+    cogs = _random_catalogue(rng, 40)
+    layouts = np.stack([np.where(rng.random((8, 12)) < 0.5, rng.permutation(96).reshape(8, 12) % 40, EMPTY) for _ in range(5)])
+    mask = rng.random((8, 12)) < 0.8
+    expected = evaluate_population(layouts, encode_catalogue(cogs), mask)
+    assert np.allclose(evaluate_population(layouts, CogInventory.from_cogs(cogs), mask), expected, rtol=1e-12)
+    assert encode_inventory(CogInventory.from_cogs([Cog(1, 2, 3)])).pattern.tolist() == [-1, -1]
@@ -0,0 +1,29 @@
+import time
+
+import numpy as np
+import pytest
+
+from ..python.islands import IslandModel
+from .test_genetic_algorithm import _small_problem
+
+
+def test_island_model_reports_per_island_stats():
+    board, cogs = _small_problem()
+    model = IslandModel(board, cogs, islands=2, migration_interval=2, migrants=2, generations=6, seed=0, population_size=12)
+    individual, fitness = model.run()
+    assert [stats['island'] for stats in model.island_stats] == [0, 1]
+    assert all(stats['generations'] == 6 for stats in model.island_stats)
+    assert all(stats['migrations_sent'] == 3 for stats in model.island_stats)
+    assert fitness == max(stats['best_fitness'] for stats in model.island_stats)
+    assert np.array_equal(np.sort(individual), np.arange(len(individual)))
+    board = model.apply_best()
+    assert np.isclose(sum(board.get_totals()), fitness)
+
+
+def test_island_model_raises_island_errors():
+    board, cogs = _small_problem()
+    model = IslandModel(board, cogs, islands=2, generations=6, seed=0, population_size=12, crossover_operator='bogus')
+    start = time.perf_counter()
+    with pytest.raises(AssertionError, match="Unknown crossover"):
+        model.run()
+    assert time.perf_counter() - start < 30
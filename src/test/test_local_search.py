@@ -0,0 +1,40 @@
+import numpy as np
+
+from ..python.board import Board
+from ..python.cogs import Cog, EmptyCog
+from ..python.local_search import LocalSearch
+from ..python.special_cogs import *
+from .test_evaluator import _random_catalogue
+
+
+def _cogs_of(board):
+    return sorted(id(cog) for cog in list(board.board.flatten()) + board.storage if not isinstance(cog, EmptyCog))
+
+
+def test_local_search_improves_layout_and_keeps_cogs():
+    rng = np.random.default_rng(7)
+    board = Board(4, 6)
+    board.unlock((rng.random((4, 6)) < 0.8).astype(int))
+    cogs = _random_catalogue(rng, 25)
+    cells = np.flatnonzero(board.mask)
+    for cell, cog in zip(cells.tolist(), cogs):
+        board.place(cell % 6, cell // 6, cog)
+    board.storage.extend(cogs[len(cells):])
+    before_cogs = _cogs_of(board)
+    board.calculate_board()
+    before = sum(board.get_totals())
+    search = LocalSearch(board, time_budget=5, max_iterations=3000, patience=500, seed=0)
+    value = search.run()
+    assert value >= before
+    assert search.iterations == 3000 and search.accepted > 0
+    assert _cogs_of(board) == before_cogs
+    board.calculate_board()
+    assert np.isclose(sum(board.get_totals()), value)
+
+
+def test_local_search_finds_best_spot_for_new_cog():
+    board = Board(3, 3, locked=False)
+    board.place(1, 1, Cog(100, 100, 0))
+    board.storage.append(Adjay(0, 0, 0, b_mult=2, f_mult=2))
+    value = LocalSearch(board, weights=(1, 1, 0), max_iterations=500, seed=1).run()
+    assert value == 400
@@ -0,0 +1,43 @@
+import numpy as np
+
+from ..python.board import Board
+from ..python.cogs import Cog, Player
+from ..python.exact import BranchAndBoundSolver
+from ..python.milp import MILPSolver
+from ..python.special_cogs import *
+from .test_exact import _brute_force
+
+
+def test_milp_matches_brute_force():
+    board = Board(3, 4)
+    board.unlock(np.array([[0, 1, 1, 0], [1, 1, 1, 0], [0, 0, 0, 0]]))
+    cogs = [Cog(10, 5, 1), Player('a', 50, 20, 9), Adjay(1, 2, 3, b_mult=2, f_mult=1.5), Rowow(4, 4, 4, b_mult=1.5, f_mult=2),
+            Cog(30, 1, 1), Diggle(2, 2, 2, b_mult=3, f_mult=1)]
+    weights = (1, 2, 1)
+    solver = MILPSolver(board, cogs, weights)
+    layout, value = solver.solve()
+    assert solver.optimal
+    assert np.isclose(value, _brute_force(board, cogs, weights))
+    assert solver.bound >= value - 1e-6 and solver.gap <= 1e-6
+    board = solver.apply_best()
+    assert np.isclose(np.array(board.get_totals()) @ np.array(weights), value)
+    assert len(board.storage) == 1
+
+
+def test_milp_matches_branch_and_bound_with_stacked_boosts():
+    board = Board(3, 3, locked=False)
+    cogs = [Adjay(1, 1, 1, b_mult=2, f_mult=2), Omni(1, 1, 1, b_mult=1.5, f_mult=3), Collumm(0, 0, 0, b_mult=2, f_mult=1, board_height=3),
+            Cog(10, 10, 10), Cog(5, 20, 5), Player('p', 40, 1, 100), Cog(7, 7, 7)]
+    expected = BranchAndBoundSolver(board, cogs, (1, 1, 0)).solve()[1]
+    solver = MILPSolver(board, cogs, (1, 1, 0))
+    assert np.isclose(solver.solve()[1], expected)
+
+
+def test_milp_respects_time_limit():
+    board = Board(locked=False)
+    cogs = [cog_type(1, 1, 1, b_mult=2, f_mult=2) for cog_type in (Adjay, Diggle, Uppy, Downer, Leff, Rite)] + \
+        [Cog(i, i, i) for i in range(30)]
+    solver = MILPSolver(board, cogs, time_limit=1)
+    layout, value = solver.solve()
+    assert not solver.optimal
+    assert layout.shape == board.mask.shape and value >= 0
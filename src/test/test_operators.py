@@ -0,0 +1,76 @@
+import numpy as np
+
+from ..python.genetic_algorithm import Idleon_Genetic_Algorithm
+from ..python.operators import (insert_mutation, order_crossover, pmx_crossover, swap_mutation,
+                                tournament_select)
+from .test_genetic_algorithm import _small_problem
+
+
+def _parents(rng, count=200, length=13):
+    return (rng.permuted(np.tile(np.arange(length), (count, 1)), axis=1),
+            rng.permuted(np.tile(np.arange(length), (count, 1)), axis=1))
+
+
+def _is_permutation(population):
+    return (np.sort(population, axis=1) == np.arange(population.shape[1])).all()
+
+
+def test_tournament_select_prefers_fitter():
+    rng = np.random.default_rng(0)
+    fitness = np.arange(100, dtype=float)
+    winners = tournament_select(fitness, 1000, 3, rng)
+    assert winners.shape == (1000,) and fitness[winners].mean() > 60
+
+
+def test_order_crossover_matches_reference():
+    rng = np.random.default_rng(1)
+    a, b = _parents(rng)
+    children = order_crossover(a, b, np.random.default_rng(2))
+    assert _is_permutation(children)
+    starts, stops = np.sort(np.random.default_rng(2).integers(0, a.shape[1] + 1, (2, len(a))), axis=0)
+    for child, parent_a, parent_b, start, stop in zip(children, a, b, starts, stops):
+        rest = parent_b[~np.isin(parent_b, parent_a[start:stop])]
+        assert np.array_equal(child, np.concatenate((rest[:start], parent_a[start:stop], rest[start:])))
+
+
+def test_pmx_crossover_matches_reference():
+    rng = np.random.default_rng(3)
+    a, b = _parents(rng)
+    children = pmx_crossover(a, b, np.random.default_rng(4))
+    assert _is_permutation(children)
+    starts, stops = np.sort(np.random.default_rng(4).integers(0, a.shape[1] + 1, (2, len(a))), axis=0)
+    for child, parent_a, parent_b, start, stop in zip(children, a, b, starts, stops):
+        expected = parent_b.copy()
+        expected[start:stop] = parent_a[start:stop]
+        for position in list(range(start)) + list(range(stop, len(parent_a))):
+            gene = parent_b[position]
+            while gene in parent_a[start:stop]:
+                gene = parent_b[np.flatnonzero(parent_a == gene)[0]]
+            expected[position] = gene
+        assert np.array_equal(child, expected)
+
+
+def test_mutations_keep_permutations():
+    rng = np.random.default_rng(5)
+    population, _ = _parents(rng)
+    original = population.copy()
+    swap_mutation(population, 0.5, rng)
+    assert _is_permutation(population)
+    changed = (population != original).sum(axis=1)
+    assert set(changed.tolist()) <= {0, 2} and 50 < np.count_nonzero(changed) < 150
+    population = np.tile(np.arange(6), (4, 1))
+    insert_mutation(population, 1.0, np.random.default_rng(6))
+    assert _is_permutation(population)
+    for row in population:
+        moved = [g for g in range(6) if np.array_equal(np.delete(row, np.flatnonzero(row == g)), np.delete(np.arange(6), g))]
+        assert moved
+
+
+def test_genetic_algorithm_with_pmx_and_insert_mutation():
+    board, cogs = _small_problem()
+    algorithm = Idleon_Genetic_Algorithm(board, cogs, population_size=30, generations=20, seed=0,
+                                         crossover_operator='pmx', mutation_operator='insert')
+    algorithm.initialize()
+    initial = algorithm.history[0]
+    algorithm.run()
+    assert _is_permutation(algorithm.population) and algorithm.history[-1] >= initial
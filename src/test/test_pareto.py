@@ -0,0 +1,50 @@
+import numpy as np
+
+from ..python.evaluator import evaluate_population
+from ..python.pareto import NSGA2, crowding_distance, non_dominated_sort
+from .test_genetic_algorithm import _small_problem
+
+
+def _brute_force_ranks(points):
+    ranks = np.full(len(points), -1)
+    rank = 0
+    while (ranks == -1).any():
+        remaining = np.flatnonzero(ranks == -1)
+        front = [i for i in remaining
+                 if not any((points[j] >= points[i]).all() and (points[j] > points[i]).any() for j in remaining)]
+        ranks[front] = rank
+        rank += 1
+    return ranks
+
+
+def test_non_dominated_sort_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        points = rng.integers(0, 6, (60, 3)).astype(float)
+        expected = _brute_force_ranks(points)
+        for block_size in (1, 7, 1024):
+            assert np.array_equal(non_dominated_sort(points, block_size=block_size), expected)
+
+
+def test_crowding_distance():
+    points = np.array([[0, 4], [1, 3], [2, 2], [4, 0], [0, 0]], dtype=float)
+    ranks = non_dominated_sort(points)
+    assert ranks.tolist() == [0, 0, 0, 0, 1]
+    distance = crowding_distance(points, ranks)
+    assert np.isinf(distance[[0, 3, 4]]).all()
+    assert np.allclose(distance[1:3], [2 / 4 + 2 / 4, 3 / 4 + 3 / 4])
+
+
+def test_nsga2_returns_valid_pareto_front():
+    board, cogs = _small_problem()
+    algorithm = NSGA2(board, cogs, population_size=30, generations=20, seed=0)
+    algorithm.run()
+    individuals, totals = algorithm.front()
+    assert len(individuals) >= 1
+    assert np.allclose(evaluate_population(algorithm.decode(individuals), cogs, board.mask), totals)
+    assert (non_dominated_sort(algorithm.totals)[algorithm.ranks == 0] == 0).all()
+    for weights in ((1, 0, 0), (0, 1, 0), (1, 1, 1)):
+        individual, value = algorithm.best_for(weights)
+        assert np.isclose(value, (algorithm.totals @ np.array(weights, dtype=float)).max())
+    algorithm.apply_best(algorithm.best_for((1, 1, 0))[0])
+    assert np.isclose(sum(board.get_totals()[:2]), algorithm.best_for((1, 1, 0))[1])
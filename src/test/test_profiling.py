@@ -0,0 +1,44 @@
+import json
+
+from ..python.board import Board
+from ..python.cogs import Cog
+from ..python.genetic_algorithm import Idleon_Genetic_Algorithm
+from ..python.profiling import PROFILER
+from ..python.special_cogs import *
+from .test_genetic_algorithm import _small_problem
+
+
+def test_disabled_profiler_records_nothing():
+    PROFILER.reset()
+    board = Board(locked=False)
+    board.place(0, 0, Adjay(1, 1, 1, 2, 2, 2))
+    board.calculate_board()
+    assert PROFILER.snapshot()['counters'] == {} and PROFILER.snapshot()['timers'] == {}
+
+
+def test_profiler_counts_hot_paths_and_dumps(tmp_path):
+    PROFILER.reset()
+    PROFILER.enable()
+    try:
+        board = Board(locked=False)
+        board.place(1, 1, Adjay(1, 1, 1, 2, 2, 2))
+        board.place(1, 2, Cog(10, 10, 10))
+        board.calculate_board()
+        board.calculate_board('vectorized')
+        board, cogs = _small_problem()
+        Idleon_Genetic_Algorithm(board, cogs, population_size=10, generations=3, seed=0).run()
+        PROFILER.start_dump(str(tmp_path / 'profile.json'), interval=0.01)
+        PROFILER.stop_dump()
+    finally:
+        PROFILER.disable()
+    snapshot = PROFILER.snapshot()
+    counters, timers = snapshot['counters'], snapshot['timers']
+    assert counters['place'] >= 2 and counters['validate'] >= counters['place']
+    assert counters['evaluations'] == 2 and counters['boosts'] == 4
+    assert counters['ga.generations'] == 3 and counters['ga.evaluations'] == 10 + 3 * 9
+    for name in ('calculate_board.reset_loop', 'calculate_board.multiply_loop', 'calculate_board.sum_loop',
+                 'calculate_board.vectorized', 'ga.generation'):
+        assert timers[name]['calls'] >= 1 and timers[name]['total'] >= 0
+    with open(str(tmp_path / 'profile.json')) as f:
+        assert json.load(f)['counters']['ga.generations'] == 3
+    PROFILER.reset()
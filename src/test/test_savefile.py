@@ -0,0 +1,53 @@
+import io
+import json
+
+import numpy as np
+
+from ..python.cogs import Cog, Player
+from ..python.evaluator import encode_catalogue, encode_inventory, evaluate_population
+from ..python.inventory import CogInventory
+from ..python.savefile import iter_json_values, load_accounts
+from ..python.special_cogs import *
+
+
+def _account(name):
+    return {
+        'account': name,
+        'mask': ['1110', [0, 1, 1, 1]],
+        'cogs': [
+            {'type': 'Cog', 'build': 10, 'flaggy': 5, 'exp': 1},
+            {'type': 'Player', 'name': 'Bob', 'build': 100, 'flaggy': 50, 'exp': 30},
+            {'type': 'Adjay', 'build': 1, 'flaggy': 2, 'exp': 3, 'b_mult': 1.5, 'f_mult': 2},
+            {'type': 'Rowow', 'b_mult': 2, 'f_mult': 1.25},
+        ],
+        'layout': [[0, 1, None, None], [None, 2, 3, None]],
+    }
+
+
+def _cogs():
+    return [Cog(10, 5, 1), Player('Bob', 100, 50, 30), Adjay(1, 2, 3, b_mult=1.5, f_mult=2), Rowow(0, 0, 0, 2, 1.25, board_width=4)]
+
+
+def test_iter_json_values_streams_arrays_and_lines():
+    values = [{'a': [1, 2, {'b': 'x]'}]}, {'c': 3}, {'d': []}]
+    for text in (json.dumps(values), '\n'.join(json.dumps(value) for value in values) + '\n', json.dumps(values, indent=2)):
+        for chunk_size in (1, 7, 1 << 16):
+            assert list(iter_json_values(io.StringIO(text), chunk_size)) == values
+    assert list(iter_json_values(io.StringIO(json.dumps(values[0])))) == [values[0]]
+
+
+def test_load_accounts_decodes_to_inventory_arrays(tmp_path):
+    with open(str(tmp_path / 'a.jsonl'), 'w') as f:
+        for name in ('first', 'second'):
+            f.write(json.dumps(_account(name)) + '\n')
+    with open(str(tmp_path / 'b.json'), 'w') as f:
+        json.dump([_account('third')], f)
+    records = list(load_accounts(str(tmp_path), chunk_size=16))
+    assert [record.account for record in records] == ['first', 'second', 'third']
+    expected = CogInventory.from_cogs(_cogs())
+    for record in records:
+        assert record.mask.tolist() == [[1, 1, 1, 0], [0, 1, 1, 1]]
+        for field in ('kind', 'base', 'mult', 'span', 'names'):
+            assert np.array_equal(getattr(record.inventory, field), getattr(expected, field))
+        totals = evaluate_population(record.layout[None], encode_inventory(record.inventory), record.mask)
+        assert np.allclose(totals, evaluate_population(record.layout[None], encode_catalogue(_cogs()), record.mask))
@@ -0,0 +1,60 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from ..python.evaluator import encode_catalogue, evaluate_population
+from ..python.genetic_algorithm import Idleon_Genetic_Algorithm
+from ..python.shared_population import SharedMemoryScorer, SharedPopulation
+from .test_evaluator import _random_catalogue
+from .test_genetic_algorithm import _small_problem
+
+
+def test_shared_population_attach_sees_same_memory():
+    population = SharedPopulation(4, (2, 3), np.int16)
+    attached = SharedPopulation.attach(population.handle)
+    population.layouts[1] = 7
+    attached.totals[2] = (1, 2, 3)
+    assert (attached.layouts[1] == 7).all() and population.totals[2].tolist() == [1, 2, 3]
+    attached.close()
+    name = population.handle.layouts_name
+    population.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name)
+
+
+def test_shared_memory_scorer_matches_serial_path():
+    rng = np.random.default_rng(0)
+    cogs = _random_catalogue(rng, 30)
+    mask = rng.random((6, 8)) < 0.8
+    with SharedMemoryScorer(encode_catalogue(cogs), mask, workers=2, capacity=5) as scorer:
+        for count in (5, 23, 1):
+            layouts = rng.integers(-1, len(cogs), (count, 6, 8))
+            assert np.array_equal(scorer(layouts), evaluate_population(layouts, cogs, mask))
+        assert scorer.population.handle.capacity == 23
+        buffer = scorer.buffer(3)
+        buffer[...] = rng.integers(-1, len(cogs), (3, 6, 8))
+        assert np.array_equal(scorer(buffer), evaluate_population(buffer, cogs, mask))
+
+
+def test_genetic_algorithm_with_shared_memory_matches_serial_path():
+    board, cogs = _small_problem()
+    serial = Idleon_Genetic_Algorithm(board, cogs, population_size=16, generations=5, seed=4)
+    shared = Idleon_Genetic_Algorithm(board, cogs, population_size=16, generations=5, seed=4, workers=2,
+                                      shared_memory=True)
+    serial.run()
+    shared.run()
+    assert isinstance(shared._pool_scorer, SharedMemoryScorer) and shared._pool_scorer.population is None
+    assert np.array_equal(serial.population, shared.population)
+    assert np.array_equal(serial.fitness, shared.fitness)
+
+
+def test_decoding_into_shared_buffer_matches_serial_path():
+    board, cogs = _small_problem()
+    ga = Idleon_Genetic_Algorithm(board, cogs, population_size=8, seed=1, workers=2, shared_memory=True)
+    population = ga.decoder.random_population(8, ga.rng)
+    buffer = ga.scorer.buffer(8)
+    layouts = ga.decoder.decode(population, buffer)
+    assert layouts is buffer and np.array_equal(layouts, ga.decode(population))
+    assert np.array_equal(ga.evaluate(population)[0], evaluate_population(ga.decode(population), cogs, ga.mask))
+    ga._pool_scorer.close()
@@ -0,0 +1,75 @@
+import numpy as np
+
+from ..python.board import Board
+from ..python.cogs import Cog, EmptyCog
+from ..python.sparse import SparseBoard, line_reach
+from ..python.special_cogs import Adjay, Collumm, Rowow
+from .test_evaluator import _random_board, _scenarios
+
+
+def test_line_reach_detects_row_and_column_footprints():
+    assert line_reach(Rowow(board_width=30).offsets_key()) == (0, 29)
+    assert line_reach(Collumm(board_height=5).offsets_key()) == (1, 4)
+    assert line_reach(Adjay().offsets_key()) is None
+
+
+def test_sparse_engine_matches_object_engine():
+    for placements in _scenarios():
+        board = Board(locked=False)
+        for x, y, cog in placements:
+            board.place(x, y, cog)
+        board.calculate_board()
+        expected = board.get_totals()
+        board.calculate_board(engine='sparse')
+        assert np.allclose(board.get_totals(), expected, rtol=1e-12)
+    rng = np.random.default_rng(3)
+    for height, width in ((8, 12), (8, 12), (5, 17), (3, 64), (4, 70)):
+        board = _random_board(rng, height=height, width=width)
+        board.calculate_board()
+        expected = board.get_totals()
+        board.calculate_board(engine='sparse')
+        assert np.allclose(board.get_totals(), expected, rtol=1e-12)
+
+
+def test_sparse_board_place_and_remove():
+    sparse = SparseBoard(40, 60, mask=np.eye(40, 60))
+    assert sparse.place(3, 4, Cog(1, 1, 1)) is None
+    assert len(sparse) == 0
+    rowow = Rowow(10, 10, 0, b_mult=2, f_mult=3, board_width=60)
+    sparse.mask[5, :] = True
+    sparse.place(0, 5, rowow)
+    sparse.place(59, 5, Cog(100, 100, 100))
+    sparse.place(5, 5, Cog(1, 1, 1))
+    assert sparse.evaluate() == (10 + 200 + 2, 10 + 300 + 3, 101)
+    assert isinstance(sparse.place(5, 5, EmptyCog()), Cog)
+    assert sparse.rows[5] == [0, 59] and 5 not in sparse.columns
+    assert sparse.evaluate() == (210, 310, 100)
+
+
+def test_board_keeps_sparse_board_up_to_date():
+    rng = np.random.default_rng(5)
+    board = _random_board(rng, height=6, width=20)
+    board.calculate_board(engine='sparse')
+    sparse = board.sparse
+    snapshot = board.snapshot()
+    height, width = board.board.shape
+
+    def check():
+        assert board.sparse is sparse
+        assert sparse.cells == SparseBoard.from_board(board).cells
+        board.calculate_board(engine='sparse')
+        expected = board.get_totals()
+        board.calculate_board()
+        assert np.allclose(board.get_totals(), expected, rtol=1e-12)
+
+    for _ in range(20):
+        x, y = int(rng.integers(width)), int(rng.integers(height))
+        board.place(x, y, Rowow(b_mult=2, board_width=width) if rng.random() < 0.5 else EmptyCog())
+        check()
+        board.delta_swap((x, y), (int(rng.integers(width)), int(rng.integers(height))))
+        board.commit() if rng.random() < 0.5 else board.rollback()
+        check()
+    board.restore(snapshot)
+    check()
+    board.mask = board.mask
+    assert board.sparse is not sparse
@@ -0,0 +1,20 @@
+import pytest
+
+from ..python.special_cogs import *
+
+
+def test_footprints_are_cached_read_only_arrays():
+    assert Adjay.footprint() is Adjay.footprint(8, 12)
+    assert Adjay(1, 1, 1).boosted()[0] is Adjay(2, 2, 2).boosted()[0] is Adjay.footprint()
+    assert Adjay.footprint().tolist() == [[0, -1], [-1, 0], [1, 0], [0, 1]]
+    with pytest.raises(ValueError):
+        Omni.footprint()[0, 0] = 5
+    assert Adjay.footprint_key() == ((0, -1), (-1, 0), (1, 0), (0, 1))
+
+
+def test_row_and_column_footprints_follow_board_size():
+    assert Rowow(board_width=3).offsets().tolist() == [[-2, 0], [-1, 0], [1, 0], [2, 0]]
+    assert Rowow(board_width=5).offsets() is Rowow.footprint(width=5) is Rowow.footprint(8, 5)
+    assert Collumm(board_height=2).offsets().tolist() == [[0, -1], [0, 1]]
+    assert Collumm(board_height=4).offsets_key() == Collumm.footprint_key(height=4)
+    assert len(Rowow.footprint(8, 12)) == 22 and len(Collumm.footprint(8, 12)) == 14
@@ -0,0 +1,71 @@
+import numpy as np
+
+from ..python.board import Board
+from ..python.cogs import Cog
+from ..python.evaluator import EMPTY, encode_catalogue, evaluate_population
+from ..python.genetic_algorithm import Idleon_Genetic_Algorithm
+from ..python.special_cogs import *
+from ..python.transposition import FULL_SYMMETRY, NO_SYMMETRY, ROW_SYMMETRY, MemoizedScorer, TranspositionTable, layout_symmetry
+from .test_genetic_algorithm import _small_problem
+
+
+def test_layout_symmetry():
+    assert layout_symmetry(encode_catalogue([Cog(1, 1, 1)]).patterns, 4) == FULL_SYMMETRY
+    assert layout_symmetry(encode_catalogue([Rowow(board_width=4)]).patterns, 4) == ROW_SYMMETRY
+    assert layout_symmetry(encode_catalogue([Rowow(board_width=3)]).patterns, 4) == NO_SYMMETRY
+    assert layout_symmetry(encode_catalogue([Rowow(board_width=4), Adjay()]).patterns, 4) == NO_SYMMETRY
+
+
+def test_equivalent_layouts_share_key_and_score():
+    cogs = [Cog(5, 5, 5), Cog(5, 5, 5), Cog(1, 2, 3), Rowow(1, 1, 1, 2, 2, 2, board_width=3), Cog(7, 0, 0)]
+    mask = np.array([[1, 1, 1], [1, 1, 0]], dtype=bool)
+    scorer = MemoizedScorer(encode_catalogue(cogs), mask)
+    layouts = np.array([
+        [[0, 2, 3], [4, 1, EMPTY]],
+        [[2, 1, 3], [0, 4, 0]],
+        [[3, 0, 2], [1, 4, EMPTY]],
+        [[0, 1, 3], [4, 2, EMPTY]],
+    ])
+    keys = scorer.keys(layouts)
+    assert keys[0] == keys[1] == keys[2] != keys[3]
+    expected = evaluate_population(layouts, scorer.catalogue, mask)
+    assert np.allclose(expected[:3], expected[0])
+    assert np.allclose(scorer(layouts), expected)
+    assert scorer.table.hits == 2 and scorer.table.misses == 2
+    assert np.allclose(scorer(layouts), expected)
+    assert scorer.table.hit_rate == 6 / 8
+
+
+def test_table_is_bounded_lru():
+    table = TranspositionTable(max_entries=2)
+    table.put('a', (1, 1, 1))
+    table.put('b', (2, 2, 2))
+    assert table.get('a') == (1, 1, 1)
+    table.put('c', (3, 3, 3))
+    assert len(table) == 2 and table.get('b') is None and table.get('a') == (1, 1, 1)
+
+
+def test_board_calculation_uses_table():
+    board = Board(2, 3, locked=False)
+    board.transposition_table = TranspositionTable()
+    board.place(0, 0, Cog(10, 20, 30))
+    board.place(1, 0, Adjay(1, 1, 1, 2, 2, 2))
+    board.calculate_board('vectorized')
+    expected = board.get_totals()
+    board.place(0, 0, Cog(10, 20, 30))
+    board.calculate_board('vectorized')
+    assert board.get_totals() == expected
+    assert board.transposition_table.hits == 1
+    board.place(2, 1, Cog(1, 1, 1))
+    board.calculate_board('vectorized')
+    assert board.transposition_table.misses == 2
+
+
+def test_genetic_algorithm_with_transposition_table_matches_plain_run():
+    board, cogs = _small_problem()
+    table = TranspositionTable()
+    plain = Idleon_Genetic_Algorithm(board, cogs, population_size=20, generations=15, seed=1).run()
+    memoized = Idleon_Genetic_Algorithm(board, cogs, population_size=20, generations=15, seed=1,
+                                        transposition_table=table).run()
+    assert np.array_equal(plain[0], memoized[0]) and np.isclose(plain[1], memoized[1])
+    assert table.hits > 0